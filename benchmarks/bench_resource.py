@@ -0,0 +1,196 @@
+"""Benchmark FirstoreBaseResource responders against the in-memory Firestore.
+
+Every responder is driven through ``falcon.testing`` with the
+Authentication middleware in front of it, so the numbers cover FireFalcon's
+own overhead (auth, validation, query building, serialization) without any
+network. Run from the repository root::
+
+    python benchmarks/bench_resource.py
+    python benchmarks/bench_resource.py --sizes 1,50 --lengths 10,1000 --json
+"""
+
+import argparse
+import gc
+import itertools
+import json
+import os
+import statistics
+import sys
+import time
+import tracemalloc
+
+import falcon
+from falcon import testing
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from firefalcon.authentication import Authentication  # noqa: E402
+from firefalcon.firestore import FirstoreBaseResource  # noqa: E402
+from firefalcon.testing import InMemoryFirestore  # noqa: E402
+
+HEADERS = {"Authorization": "Bearer benchmark-token"}
+
+
+class FakeAuth:
+    def verify_id_token(self, id_token, check_revoked=False):
+        return {"uid": id_token, "exp": time.time() + 3600}
+
+
+def make_document(size):
+    """Return a document with roughly ``size`` scalar fields."""
+    doc = {"name": "Benchmark User", "age": 42}
+    for i in range(max(size - 2, 0)):
+        doc[f"field_{i}"] = f"value {i}" if i % 2 else i
+    return doc
+
+
+def make_app(db, auth_cache_size, **options):
+    authentication = Authentication(FakeAuth(), cache_size=auth_cache_size)
+    resource = FirstoreBaseResource(db=db, resource_type="user", **options)
+
+    api = falcon.App(middleware=[authentication])
+    api.add_route("/users", resource)
+    api.add_route("/users/{user_id}", resource, suffix="doc")
+    return testing.TestClient(api)
+
+
+def make_db(length, size):
+    db = InMemoryFirestore()
+    batch = db.batch()
+    for i in range(length):
+        batch.set(db.document(f"users/u{i:06}"), make_document(size))
+    batch.commit()
+    return db
+
+
+def scenarios(client, length, size):
+    doc = make_document(size)
+    counter = itertools.count()
+
+    def post():
+        return client.simulate_post("/users", json=doc, headers=HEADERS)
+
+    def bulk_post():
+        return client.simulate_post("/users", json=[doc] * 100, headers=HEADERS)
+
+    def put():
+        return client.simulate_put("/users/u000000", json=doc, headers=HEADERS)
+
+    def patch():
+        return client.simulate_patch(
+            "/users/u000000", json={"age": next(counter)}, headers=HEADERS
+        )
+
+    def delete():
+        # Recreate first so every iteration deletes an existing document.
+        client.simulate_put("/users/scratch", json=doc, headers=HEADERS)
+        return client.simulate_delete("/users/scratch", headers=HEADERS)
+
+    return {
+        "on_get": lambda: client.simulate_get(
+            "/users", params={"limit": length}, headers=HEADERS
+        ),
+        "on_get_doc": lambda: client.simulate_get("/users/u000000", headers=HEADERS),
+        "on_post": post,
+        "on_post[bulk100]": bulk_post,
+        "on_put_doc": put,
+        "on_patch_doc": patch,
+        "on_delete_doc": delete,
+    }
+
+
+def measure(func, iterations, warmup):
+    for _ in range(warmup):
+        func()
+
+    gc.collect()
+    timings = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        response = func()
+        timings.append(time.perf_counter() - start)
+
+    if response.status_code >= 400:
+        raise RuntimeError(f"{response.status}: {response.text}")
+
+    tracemalloc.start()
+    peaks = []
+    for _ in range(min(iterations, 50)):
+        tracemalloc.reset_peak()
+        baseline = tracemalloc.get_traced_memory()[0]
+        func()
+        peaks.append(tracemalloc.get_traced_memory()[1] - baseline)
+    tracemalloc.stop()
+
+    timings.sort()
+    total = sum(timings)
+    return {
+        "rps": iterations / total,
+        "p50_ms": statistics.median(timings) * 1000,
+        "p99_ms": timings[min(len(timings) - 1, int(len(timings) * 0.99))] * 1000,
+        "alloc_kib": statistics.median(peaks) / 1024,
+    }
+
+
+def run(args):
+    results = []
+    for length, size in itertools.product(args.lengths, args.sizes):
+        for auth_cache_size in args.auth_cache:
+            db = make_db(length, size)
+            client = make_app(db, auth_cache_size)
+            for name, func in scenarios(client, length, size).items():
+                if args.only and name not in args.only:
+                    continue
+                result = measure(func, args.iterations, args.warmup)
+                result.update(
+                    responder=name,
+                    length=length,
+                    size=size,
+                    auth_cache=auth_cache_size,
+                )
+                results.append(result)
+                if not args.json:
+                    print(format_row(result), flush=True)
+    return results
+
+
+def format_row(result):
+    return (
+        f"{result['responder']:<18} len={result['length']:<6} "
+        f"size={result['size']:<4} auth_cache={result['auth_cache']:<5} "
+        f"{result['rps']:>10.1f} req/s  p50={result['p50_ms']:>8.3f} ms  "
+        f"p99={result['p99_ms']:>8.3f} ms  alloc={result['alloc_kib']:>9.1f} KiB"
+    )
+
+
+def int_list(value):
+    return [int(item) for item in value.split(",")]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--warmup", type=int, default=20)
+    parser.add_argument(
+        "--sizes", type=int_list, default=[5, 50], help="fields per document"
+    )
+    parser.add_argument(
+        "--lengths", type=int_list, default=[10, 100], help="documents per list"
+    )
+    parser.add_argument(
+        "--auth-cache",
+        type=int_list,
+        default=[1024],
+        help="Authentication cache sizes to compare (0 disables the cache)",
+    )
+    parser.add_argument("--only", nargs="*", help="responders to run")
+    parser.add_argument("--json", action="store_true", help="print JSON results")
+    args = parser.parse_args(argv)
+
+    results = run(args)
+    if args.json:
+        print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+import threading
+import time
+from collections import OrderedDict
+
+
+class TTLCache:
+    """A thread-safe LRU cache whose entries also expire after a deadline.
+
+    Entries are evicted in least-recently-used order once ``maxsize`` is
+    reached, and are dropped on lookup once their expiry time has passed.
+    A ``maxsize`` of 0 disables the cache entirely.
+    """
+
+    def __init__(self, maxsize=1024, ttl=None, clock=time.time):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._clock = clock
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def __len__(self):
+        return len(self._data)
+
+    def __contains__(self, key):
+        return self.get(key, _MISSING, count=False) is not _MISSING
+
+    def get(self, key, default=None, count=True):
+        with self._lock:
+            entry = self._data.get(key)
+
+            if entry is not None:
+                value, expires_at = entry
+                if expires_at is None or expires_at > self._clock():
+                    self._data.move_to_end(key)
+                    if count:
+                        self.hits += 1
+                    return value
+
+                del self._data[key]
+                self.expirations += 1
+
+            if count:
+                self.misses += 1
+            return default
+
+    def set(self, key, value, ttl=None, expires_at=None):
+        if self.maxsize <= 0:
+            return
+
+        if expires_at is None:
+            ttl = self.ttl if ttl is None else ttl
+            if ttl is not None:
+                expires_at = self._clock() + ttl
+
+        with self._lock:
+            self._data[key] = (value, expires_at)
+            self._data.move_to_end(key)
+
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def pop(self, key, default=None):
+        with self._lock:
+            entry = self._data.pop(key, None)
+        if entry is None:
+            return default
+        return entry[0]
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+        }
+
+
+_MISSING = object()
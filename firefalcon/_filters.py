@@ -0,0 +1,187 @@
+"""Parse ``where`` query parameters into Firestore filters.
+
+A ``where`` value is one or more ``field op value`` clauses joined by
+``AND``::
+
+    status == "active" AND age >= 21
+    tags array-contains-any ["a", "b"] AND country in [GB, IE]
+
+Values are typed: numbers, ``true``/``false``/``null``, ISO 8601 datetimes,
+quoted strings and ``[...]`` lists. Other bare words are strings. Parsed
+plans are kept in an LRU cache keyed by the raw parameter.
+"""
+
+import collections
+import datetime
+import json
+import re
+
+from ._cache import TTLCache
+
+Filter = collections.namedtuple("Filter", ["field", "op", "value"])
+
+OPERATORS = {
+    "=": "==",
+    "==": "==",
+    "!=": "!=",
+    "<": "<",
+    "<=": "<=",
+    ">": ">",
+    ">=": ">=",
+    "in": "in",
+    "not-in": "not-in",
+    "array-contains": "array_contains",
+    "array-contains-any": "array_contains_any",
+}
+LIST_OPERATORS = {"in", "not-in", "array_contains_any"}
+INEQUALITY_OPERATORS = {"!=", "<", "<=", ">", ">=", "not-in"}
+
+_TOKEN = re.compile(
+    r"""\s*(?:
+        (?P<string>"(?:[^"\\]|\\.)*"|'(?:[^'\\]|\\.)*')
+        |(?P<op>==|!=|<=|>=|<|>|=)
+        |(?P<punct>[\[\],])
+        |(?P<word>[^\s\[\],"'<>=!]+)
+    )""",
+    re.VERBOSE,
+)
+_FIELD = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*(\.[A-Za-z_][A-Za-z0-9_]*)*$")
+_NUMBER = re.compile(r"^-?\d+(\.\d+)?([eE][-+]?\d+)?$")
+_DATETIME = re.compile(r"^\d{4}-\d{2}-\d{2}T")
+_KEYWORDS = {"true": True, "false": False, "null": None}
+
+_plans = TTLCache(maxsize=1024)
+
+
+def _tokenize(text):
+    tokens = []
+    position = 0
+    text = text.rstrip()
+    while position < len(text):
+        match = _TOKEN.match(text, position)
+        if match is None or match.end() == position:
+            raise ValueError(f"Unexpected character in where at {position}")
+        kind = match.lastgroup
+        tokens.append((kind, match.group(kind)))
+        position = match.end()
+    return tokens
+
+
+def _string(token):
+    if token.startswith("'"):
+        token = '"' + token[1:-1].replace("\\'", "'").replace('"', '\\"') + '"'
+    return json.loads(token)
+
+
+def _word(token):
+    if token in _KEYWORDS:
+        return _KEYWORDS[token]
+    if _NUMBER.match(token):
+        return float(token) if any(c in token for c in ".eE") else int(token)
+    if _DATETIME.match(token):
+        try:
+            return datetime.datetime.fromisoformat(token.replace("Z", "+00:00"))
+        except ValueError:
+            pass
+    return token
+
+
+class _Parser:
+    def __init__(self, text):
+        self.tokens = _tokenize(text)
+        self.position = 0
+
+    def next(self, expected=None):
+        if self.position >= len(self.tokens):
+            raise ValueError("Unexpected end of where")
+        token = self.tokens[self.position]
+        if expected is not None and token[0] != expected:
+            raise ValueError(f"Expected {expected} in where, got {token[1]!r}")
+        self.position += 1
+        return token
+
+    def at_end(self):
+        return self.position >= len(self.tokens)
+
+    def scalar(self):
+        kind, token = self.next()
+        if kind == "string":
+            return _string(token)
+        if kind == "word":
+            return _word(token)
+        raise ValueError(f"Expected a value in where, got {token!r}")
+
+    def value(self):
+        if self.tokens[self.position] != ("punct", "["):
+            return self.scalar()
+
+        self.next()
+        items = []
+        while self.tokens[self.position : self.position + 1] != [("punct", "]")]:
+            items.append(self.scalar())
+            if self.tokens[self.position : self.position + 1] == [("punct", ",")]:
+                self.next()
+        self.next()
+        return tuple(items)
+
+    def clause(self):
+        _, field = self.next("word")
+        if not _FIELD.match(field):
+            raise ValueError(f"Invalid field name in where: {field!r}")
+
+        _, op = self.next()
+        if op not in OPERATORS:
+            raise ValueError(f"Unknown operator in where: {op!r}")
+        op = OPERATORS[op]
+
+        if self.at_end():
+            raise ValueError("Unexpected end of where")
+        value = self.value()
+        if (op in LIST_OPERATORS) != isinstance(value, tuple):
+            kind = "a list" if op in LIST_OPERATORS else "a single value"
+            raise ValueError(f"{op} in where takes {kind}")
+        return Filter(field, op, value)
+
+    def parse(self):
+        filters = [self.clause()]
+        while not self.at_end():
+            _, word = self.next("word")
+            if word.upper() != "AND":
+                raise ValueError(f"Expected AND in where, got {word!r}")
+            filters.append(self.clause())
+        return tuple(filters)
+
+
+def parse_where(text):
+    """Return the filters in ``text`` as a tuple of :class:`Filter`.
+
+    Raises ``ValueError`` on invalid syntax. List values are tuples so that
+    cached plans cannot be modified.
+    """
+    filters = _plans.get(text)
+    if filters is None:
+        filters = _Parser(text).parse()
+        _plans.set(text, filters)
+    return filters
+
+
+def inequality_fields(filters):
+    return {f.field for f in filters if f.op in INEQUALITY_OPERATORS}
+
+
+def required_index(filters, order_by=None):
+    """Return the fields of the composite index ``filters`` need, if any.
+
+    Firestore serves equality-only queries, and queries sorting or ranging
+    on a single field, from its automatic single-field indexes. Mixing
+    equality filters with a range or sort on another field, or ranging on
+    several fields, needs a composite index on all of those fields.
+    """
+    sort_fields = inequality_fields(filters)
+    if order_by:
+        sort_fields.add(order_by)
+    equality_fields = {f.field for f in filters} - sort_fields
+
+    if not sort_fields or (len(sort_fields) == 1 and not equality_fields):
+        return None
+    return frozenset(sort_fields | equality_fields)
@@ -1,4 +1,9 @@
-from pydantic import BaseModel, validator
+from pydantic import BaseModel, ValidationError, conint, root_validator, validator
+
+from ._filters import inequality_fields, parse_where
+from ._utils import decode_cursor
+
+MAX_IDS = 1000
 
 
 class BaseSchema(BaseModel):
@@ -8,12 +13,112 @@ class BaseSchema(BaseModel):
 
 class BaseQuerySchema(BaseModel):
     where: list = None
-    limit: int = 100
-    offset: int = 0
-    order_by: str = "ASCENDING"
+    limit: conint(ge=1, le=1000) = 100
+    offset: conint(ge=0) = 0
+    order_by: str = None
+    order_dir: str = "ASCENDING"
+    fields: list = None
+    cursor: dict = None
+    count: str = None
+    ids: list = None
+    include: list = None
+
+    @root_validator(pre=True)
+    def collect_fields(cls, values):
+        # Accept JSON:API style ``fields[type]=a,b`` as well as ``fields=a,b``.
+        if "fields" in values:
+            return values
+        for key, value in values.items():
+            if key.startswith("fields[") and key.endswith("]"):
+                return {**values, "fields": value}
+        return values
 
     @validator("where", pre=True)
-    def split_str(cls, v):
+    def parse_filters(cls, v):
+        if v is None:
+            return v
+        return parse_where(v)
+
+    @validator("order_by", always=True)
+    def default_order_by(cls, v, values):
+        # Firestore sorts by the range-filtered field first; paginate on it.
+        if v is None:
+            fields = inequality_fields(values.get("where") or ())
+            if len(fields) == 1:
+                return fields.pop()
+        return v
+
+    @validator("fields", "ids", "include", pre=True)
+    def split_fields(cls, v):
+        if v is None:
+            return v
+        if isinstance(v, str):
+            v = [v]
+        return [name.strip() for item in v for name in item.split(",") if name.strip()]
+
+    @validator("ids")
+    def check_ids(cls, v):
+        if len(v) > MAX_IDS:
+            raise ValueError(f"at most {MAX_IDS} ids can be fetched at once")
+        if any("/" in doc_id for doc_id in v):
+            raise ValueError("ids cannot contain '/'")
+        # Drop duplicates, keeping the requested order.
+        return list(dict.fromkeys(v))
+
+    @validator("order_dir")
+    def check_order_dir(cls, v):
+        v = v.upper()
+        if v not in ("ASCENDING", "DESCENDING"):
+            raise ValueError("order_dir must be ASCENDING or DESCENDING")
+        return v
+
+    @validator("count")
+    def check_count(cls, v):
+        v = v.lower()
+        if v == "false":
+            return None
+        if v not in ("true", "only"):
+            raise ValueError("count must be true, false or only")
+        return v
+
+    @validator("cursor", pre=True)
+    def parse_cursor(cls, v, values):
         if v is None:
             return v
-        return v.split(" AND ")
+        cursor = decode_cursor(v)
+        if set(cursor) != {"__name__", values.get("order_by")} - {None}:
+            raise ValueError("cursor does not match order_by")
+        return cursor
+
+
+def validate_fields(schema, data, fields):
+    """Validate only the projected ``fields`` of ``data`` against ``schema``.
+
+    Each selected top-level field runs through its own field validators;
+    model-wide validators are skipped since the rest of the model is absent.
+    Nested maps selected by a dotted path are returned without validation.
+    """
+    selected = {name for name in fields if "." not in name}
+    by_alias = {field.alias: field for field in schema.__fields__.values()}
+
+    values = {}
+    extra = {}
+    errors = []
+
+    for key, value in data.items():
+        field = by_alias.get(key)
+        if field is None or key not in selected:
+            extra[key] = value
+            continue
+
+        value, error = field.validate(value, values, loc=key, cls=schema)
+        if error:
+            errors.append(error)
+        else:
+            values[field.name] = value
+
+    if errors:
+        raise ValidationError(errors, schema)
+
+    model = schema.construct(_fields_set=set(values), **values)
+    return {**extra, **model.dict(include=set(values))}
@@ -1,15 +1,221 @@
-def create_collection_query(collection, params=None):
+import base64
+import binascii
+import datetime
+import hashlib
+import json
+
+try:
+    from google.cloud.firestore_v1.base_query import FieldFilter
+except ImportError:  # google-cloud-firestore < 2.11
+    FieldFilter = None
+
+
+def _apply_filters(query, params):
+    for field, op, value in params.where or ():
+        if isinstance(value, tuple):
+            value = list(value)
+        if FieldFilter is None:
+            query = query.where(field, op, value)
+        else:
+            query = query.where(filter=FieldFilter(field, op, value))
+    return query
+
+
+def select_fields(params, extra=()):
+    """Return the field paths to fetch for ``params``, or ``None`` for all."""
+    if not params.fields:
+        return None
+
+    fields = list(params.fields)
+    for name in extra:
+        if name not in fields:
+            fields.append(name)
+    return fields
+
+
+def create_collection_query(collection, params=None, extra_fields=()):
     if params is None:
         return collection
-    # if req.params:
-    #     params = self._validate_q(req.params)
 
-    #     if params.order_by:
-    #         query = query.order_by(
-    #             field_path=params.order_by, direction=params.order_dir
-    #         )
+    query = _apply_filters(collection, params)
+    if params.fields:
+        # The cursor for the next page needs the order_by value.
+        extra = (params.order_by,) if params.order_by else ()
+        query = query.select(select_fields(params, extra + tuple(extra_fields)))
+
+    if params.order_by:
+        query = query.order_by(params.order_by, direction=params.order_dir)
+    # Order by document id last so every page boundary is unambiguous.
+    query = query.order_by("__name__", direction=params.order_dir)
+
+    if params.cursor:
+        query = query.start_after(params.cursor)
+    elif params.offset:
+        query = query.offset(params.offset)
+
+    return query.limit(params.limit)
+
+
+def create_watch_query(collection, params):
+    """Return the query to listen on for changes matching ``params``."""
+    return _apply_filters(collection, params)
+
+
+def create_count_query(collection, params):
+    """Return a count aggregation over the documents matching ``params``."""
+    return _apply_filters(collection, params).count(alias="total")
+
+
+def count_result(results):
+    """Return the total from a ``count(alias="total")`` aggregation result."""
+    for result in results[0]:
+        if result.alias == "total":
+            return result.value
+    raise ValueError("Count aggregation returned no total")
+
+
+def create_cursor(doc, params):
+    values = {"__name__": doc.id}
+    if params.order_by:
+        values[params.order_by] = doc.get(params.order_by)
+    return encode_cursor(values)
+
+
+def _encode_value(value):
+    if isinstance(value, datetime.datetime):
+        return {"$datetime": value.isoformat()}
+    raise TypeError(f"Cannot use {type(value).__name__} in a cursor")
+
+
+def _decode_value(obj):
+    if "$datetime" in obj:
+        return datetime.datetime.fromisoformat(obj["$datetime"])
+    return obj
+
+
+def encode_cursor(values):
+    raw = json.dumps(values, default=_encode_value, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor):
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        values = json.loads(raw, object_hook=_decode_value)
+    except (binascii.Error, ValueError) as e:
+        raise ValueError("Invalid pagination cursor") from e
+
+    if not isinstance(values, dict) or "__name__" not in values:
+        raise ValueError("Invalid pagination cursor")
+    return values
+
+
+def _child(value, key):
+    if isinstance(value, dict):
+        return value[key]
+    # Validated pydantic models expose fields as attributes.
+    return getattr(value, key)
+
+
+def project(data, fields):
+    """Pick the (possibly dotted) field paths in ``fields`` out of ``data``."""
+    result = {}
+    for path in fields:
+        parts = path.split(".")
+        value = data
+        try:
+            for part in parts:
+                value = _child(value, part)
+        except (KeyError, TypeError, AttributeError):
+            continue
+
+        target = result
+        for part in parts[:-1]:
+            target = target.setdefault(part, {})
+        target[parts[-1]] = value
+    return result
+
+
+def create_etag(update_time):
+    digest = hashlib.sha1(update_time.isoformat().encode()).hexdigest()
+    return f'"{digest[:20]}"'
+
+
+def etag_matches(if_none_match, etag):
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == etag:
+            return True
+    return False
+
+
+def bulk_error(index, title, detail, status="400"):
+    return {
+        "status": status,
+        "title": title,
+        "detail": detail,
+        "source": {"pointer": f"/{index}"},
+        "meta": {"index": index},
+    }
+
+
+def prepend(first, rest):
+    # Unlike itertools.chain, closing this also closes the wrapped generator.
+    yield first
+    yield from rest
+
+
+async def prepend_async(first, rest):
+    yield first
+    async for chunk in rest:
+        yield chunk
+
+
+class StreamEncoder:
+    """Assemble a ``{"data": [...], "links": ...}`` body from encoded items.
+
+    ``add`` returns a chunk to send once enough bytes are buffered (and after
+    the very first item), otherwise ``None``.
+    """
+
+    def __init__(self, chunk_size):
+        self.chunk_size = chunk_size
+        self.count = 0
+        self._chunk = [b'{"data":[']
+        self._size = 0
+
+    def add(self, item):
+        if self.count:
+            self._chunk.append(b",")
+        self._chunk.append(item)
+        self._size += len(item)
+        self.count += 1
+
+        if self.count == 1 or self._size >= self.chunk_size:
+            return self._flush()
+        return None
+
+    def finish(self, links, meta=None):
+        self._chunk.append(b'],"links":')
+        self._chunk.append(links)
+        if meta is not None:
+            self._chunk.append(b',"meta":')
+            self._chunk.append(meta)
+        self._chunk.append(b"}")
+        return self._flush()
 
-    return collection
+    def _flush(self):
+        chunk = b"".join(self._chunk)
+        self._chunk = []
+        self._size = 0
+        return chunk
 
 
 def parse_docs(self, docs):
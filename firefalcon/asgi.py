@@ -0,0 +1,291 @@
+"""ASGI counterparts of the FireFalcon resource and middleware.
+
+These require Falcon 3's ASGI app and a ``firestore.AsyncClient``. Query
+building, validation, authorization and response formatting are shared
+with the WSGI classes; only the Firestore calls are awaited.
+"""
+
+import asyncio
+import functools
+import inspect
+
+import falcon
+from firebase_admin.exceptions import AlreadyExistsError, FirebaseError, NotFoundError
+
+from ._utils import (
+    StreamEncoder,
+    count_result,
+    create_collection_query,
+    create_count_query,
+    prepend_async,
+    select_fields,
+)
+from .authentication import Authentication
+from .authorize import Authorize
+from .firestore import WRITE_ERRORS, FirstoreBaseResource
+from .instrumentation import timed
+
+
+class AsyncAuthentication(Authentication):
+    """ASGI version of :class:`~firefalcon.authentication.Authentication`.
+
+    Cached tokens are served without leaving the event loop. Cache misses
+    await ``verifier`` if it is a coroutine function, otherwise the blocking
+    verification runs in the default executor.
+    """
+
+    async def verify_async(self, id_token):
+        key = self._cache_key(id_token)
+
+        decoded_token = self.cache.get(key)
+        if decoded_token is not None:
+            return decoded_token
+
+        if inspect.iscoroutinefunction(self._verifier):
+            decoded_token = await self._verifier(id_token, check_revoked=True)
+        else:
+            loop = asyncio.get_running_loop()
+            verify = functools.partial(self._verifier, id_token, check_revoked=True)
+            decoded_token = await loop.run_in_executor(None, verify)
+
+        return self._remember(key, decoded_token)
+
+    async def process_request(self, req, resp):
+        id_token = self._get_id_token(req)
+
+        try:
+            with timed(req, "auth"):
+                req.context.token = await self.verify_async(id_token)
+
+        except self._revoked_errors:
+            raise self._revoked_token()
+
+        except Exception:
+            raise self._invalid_token()
+
+
+class AsyncAuthorize(Authorize):
+    """Awaitable :class:`~firefalcon.authorize.Authorize` for ASGI hooks."""
+
+    async def __call__(self, req, resp, resource, params):
+        super().__call__(req, resp, resource, params)
+
+
+class AsyncFirstoreBaseResource(FirstoreBaseResource):
+    """ASGI version of :class:`~firefalcon.firestore.FirstoreBaseResource`.
+
+    ``db`` must be a ``google.cloud.firestore.AsyncClient``.
+    """
+
+    async def _count_async(self, req, col_ref, db_path, params):
+        key = self._query_key(db_path, params)
+        total = self.count_cache.get(key)
+
+        if total is None:
+            with timed(req, "firestore"):
+                results = await create_count_query(col_ref, params).get()
+            total = count_result(results)
+            self.count_cache.set(key, total)
+
+        return {"total": total}
+
+    async def _get_many_async(self, req, resp, col_ref, db_path, params):
+        entries, refs = self._many_refs(col_ref, db_path, params)
+        if refs:
+            field_paths = select_fields(params, params.include or ())
+            with timed(req, "firestore"):
+                docs = [
+                    doc async for doc in self._db.get_all(refs, field_paths=field_paths)
+                ]
+            entries.update(self._load_many(req, resp, db_path, docs, params.fields))
+        self._many_response(req, resp, params, entries)
+
+    async def _include_async(self, req, resp, params):
+        refs = self._include_refs(resp.media["data"], params.include)
+        docs = []
+        if refs:
+            with timed(req, "firestore"):
+                docs = [doc async for doc in self._db.get_all(refs)]
+        resp.media["included"] = self._included_resources(docs)
+
+    async def _stream_collection_async(self, req, docs, params, meta=None):
+        encoder = StreamEncoder(self._stream_chunk_size)
+        doc = None
+
+        async for doc in docs:
+            resource = self._doc_resource(doc, params.fields, as_model=True)
+            chunk = encoder.add(self._dumps(resource))
+            if chunk:
+                yield chunk
+
+        links = self._collection_links(req, params, doc, encoder.count)
+        yield encoder.finish(
+            self._dumps(links), None if meta is None else self._dumps(meta)
+        )
+
+    async def _bulk_create_async(self, req, resp, col_ref, items):
+        with timed(req, "validate"):
+            chunks, errors = self._bulk_prepare(col_ref, items)
+        data = []
+
+        for chunk in chunks:
+            try:
+                with timed(req, "firestore"):
+                    await self._bulk_batch(chunk).commit()
+            except WRITE_ERRORS as e:
+                errors.extend(self._bulk_failed(chunk, e))
+            else:
+                data.extend(self._bulk_created(chunk))
+
+        self._bulk_response(req, resp, data, errors)
+
+    @falcon.before(AsyncAuthorize("on_get"))
+    async def on_get(self, req, resp, **kwargs):
+        try:
+            db_path = self.get_db_path(req.path)
+            col_ref = self._db.collection(db_path)
+
+            with timed(req, "validate"):
+                params = self._validate_q(req.params)
+
+            if params.ids is not None:
+                await self._get_many_async(req, resp, col_ref, db_path, params)
+                if params.include:
+                    await self._include_async(req, resp, params)
+                return
+
+            meta = None
+            if params.count:
+                meta = await self._count_async(req, col_ref, db_path, params)
+                if params.count == "only":
+                    self._count_response(req, resp, meta)
+                    return
+
+            query_ref = create_collection_query(
+                col_ref, params, extra_fields=params.include or ()
+            )
+
+            if self._stream and not params.include:
+                chunks = self._stream_collection_async(
+                    req, query_ref.stream(), params, meta
+                )
+                first = await chunks.__anext__()
+
+                resp.status = falcon.HTTP_200
+                resp.content_type = falcon.MEDIA_JSON
+                resp.stream = prepend_async(first, chunks)
+                return
+
+            with timed(req, "firestore"):
+                docs = await query_ref.get()
+            self._collection_response(req, resp, params, docs, meta)
+            if params.include:
+                await self._include_async(req, resp, params)
+
+        except FirebaseError as e:
+            raise falcon.HTTPBadRequest(code=e.code, description=e.message)
+
+    @falcon.before(AsyncAuthorize("on_get_doc"))
+    async def on_get_doc(self, req, resp, **kwargs):
+        try:
+            db_path = self.get_db_path(req.path)
+            with timed(req, "validate"):
+                fields = self._validate_q(req.params).fields
+            entry = self.doc_cache.get(db_path)
+
+            if entry is None:
+                with timed(req, "firestore"):
+                    doc = await self._db.document(db_path).get(field_paths=fields)
+                entry = self._load_doc(req, resp, db_path, doc, fields)
+                if entry is None:
+                    return
+
+            self._doc_response(req, resp, entry, fields)
+
+        except FirebaseError as e:
+            raise falcon.HTTPBadRequest(code=e.code, description=e.message)
+
+    @falcon.before(AsyncAuthorize("on_post"))
+    async def on_post(self, req, resp, **kwargs):
+        try:
+            db_path = self.get_db_path(req.path)
+            col_ref = self._db.collection(db_path)
+
+            media = await req.get_media()
+            if isinstance(media, list):
+                await self._bulk_create_async(req, resp, col_ref, media)
+                return
+
+            with timed(req, "validate"):
+                validated = self._validate_post(media)
+            doc_ref, valid_dict = self._prepare_post(col_ref, validated)
+
+            with timed(req, "firestore"):
+                await doc_ref.create(valid_dict)
+
+            self._write_response(req, resp, falcon.HTTP_201, doc_ref.id, valid_dict)
+
+        except AlreadyExistsError as e:
+            raise falcon.HTTPConflict(code=e.code, description=e.message)
+
+        except FirebaseError as e:
+            raise falcon.HTTPBadRequest(code=e.code, description=e.message)
+
+    @falcon.before(AsyncAuthorize("on_put_doc"))
+    async def on_put_doc(self, req, resp, **kwargs):
+        try:
+            media = await req.get_media()
+            with timed(req, "validate"):
+                validated = self._validate_put(media)
+
+            db_path = self.get_db_path(req.path)
+            doc_ref = self._db.document(db_path)
+
+            attributes = validated.dict()
+            with timed(req, "firestore"):
+                await doc_ref.set(attributes)
+            self.doc_cache.pop(db_path)
+
+            self._write_response(req, resp, falcon.HTTP_200, doc_ref.id, attributes)
+
+        except FirebaseError as e:
+            raise falcon.HTTPBadRequest(code=e.code, description=e.message)
+
+    @falcon.before(AsyncAuthorize("on_put_doc"))
+    async def on_patch_doc(self, req, resp, **kwargs):
+        try:
+            media = await req.get_media()
+            with timed(req, "validate"):
+                validated = self._validate_patch(media)
+
+            db_path = self.get_db_path(req.path)
+            doc_ref = self._db.document(db_path)
+
+            attributes = validated.dict()
+            with timed(req, "firestore"):
+                await doc_ref.update(attributes)
+            self.doc_cache.pop(db_path)
+
+            self._write_response(req, resp, falcon.HTTP_200, doc_ref.id, attributes)
+
+        except NotFoundError as e:
+            raise falcon.HTTPNotFound(code=e.code, description=e.message)
+
+        except FirebaseError as e:
+            raise falcon.HTTPBadRequest(code=e.code, description=e.message)
+
+    @falcon.before(AsyncAuthorize("on_delete_doc"))
+    async def on_delete_doc(self, req, resp, **kwargs):
+        try:
+            db_path = self.get_db_path(req.path)
+            doc_ref = self._db.document(db_path)
+
+            with timed(req, "firestore"):
+                await doc_ref.delete()
+            self.doc_cache.pop(db_path)
+
+        except NotFoundError as e:
+            raise falcon.HTTPNotFound(code=e.code, description=e.message)
+
+        except FirebaseError as e:
+            raise falcon.HTTPBadRequest(code=e.code, description=e.message)
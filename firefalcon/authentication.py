@@ -1,46 +1,107 @@
+import hashlib
+import time
+
 import falcon
 
+from ._cache import TTLCache
+from .instrumentation import timed
+
+
 class Authentication:
-    def __init__(self, auth):
+    """Verify Firebase ID tokens and attach the decoded claims to the request.
+
+    Decoded tokens are cached by a hash of the raw token until the token's
+    ``exp`` claim or ``recheck_interval`` seconds, whichever comes first, so
+    a token is only re-checked for revocation once per interval. Set
+    ``cache_size`` to 0 to verify every request.
+
+    ``verifier`` defaults to ``auth.verify_id_token`` and may be any callable
+    accepting ``(id_token, check_revoked=True)``.
+    """
+
+    def __init__(
+        self,
+        auth,
+        cache_size=1024,
+        recheck_interval=300,
+        verifier=None,
+        clock=time.time,
+    ):
         self.auth = auth
-        
-    def process_request(self, req, resp):
-        bearer_auth = req.auth
+        self.recheck_interval = recheck_interval
+        self.cache = TTLCache(maxsize=cache_size, clock=clock)
+        self._clock = clock
+        self._verifier = verifier or auth.verify_id_token
+        self._revoked_errors = tuple(
+            getattr(auth, name)
+            for name in ("RevokedIdTokenError", "UserDisabledError")
+            if hasattr(auth, name)
+        )
+
+    def _cache_key(self, id_token):
+        return hashlib.sha256(id_token.encode()).hexdigest()
+
+    def _remember(self, key, decoded_token):
+        expires_at = self._clock() + self.recheck_interval
+        exp = decoded_token.get("exp")
+        if exp is not None:
+            expires_at = min(expires_at, exp)
 
-        challenges = ['Token type="Bearer"']
+        self.cache.set(key, decoded_token, expires_at=expires_at)
+        return decoded_token
+
+    def verify(self, id_token):
+        key = self._cache_key(id_token)
+
+        decoded_token = self.cache.get(key)
+        if decoded_token is not None:
+            return decoded_token
+
+        decoded_token = self._verifier(id_token, check_revoked=True)
+        return self._remember(key, decoded_token)
+
+    def _unauthorized(self, title, description):
+        return falcon.HTTPUnauthorized(
+            title=title,
+            description=description,
+            challenges=['Token type="Bearer"'],
+        )
+
+    def _get_id_token(self, req):
+        bearer_auth = req.auth
 
         if bearer_auth is None:
             description = "Please provide an auth token as part of the request."
+            raise self._unauthorized("Auth token required", description)
 
-            raise falcon.HTTPUnauthorized(
-                "Auth token required", description, challenges
-            )
+        parts = bearer_auth.split()
+        if len(parts) != 2:
+            raise self._invalid_token()
+        return parts[1]
 
-        try:
-            id_token = bearer_auth.split()[1]
-            check_token = auth.verify_id_token(id_token, check_revoked=True)
+    def _revoked_token(self):
+        description = (
+            "The provided auth token has been revoked. "
+            "Please request a new token and try again."
+        )
+        return self._unauthorized("Authentication required", description)
 
-        except:
-            description = (
-                "The provided auth token has been revoked. "
-                "Please request a new token and try again."
-            )
+    def _invalid_token(self):
+        description = (
+            "The provided auth token is not valid. "
+            "Please request a new token and try again."
+        )
+        return self._unauthorized("Authentication required", description)
 
-            raise falcon.HTTPUnauthorized(
-                "Authentication required", description, challenges
-            )
+    def process_request(self, req, resp):
+        id_token = self._get_id_token(req)
 
         try:
-            decoded_token = auth.verify_id_token(id_token)
-            req.context.token = decoded_token
-            return
-
-        except:
-            description = (
-                "The provided auth token is not valid. "
-                "Please request a new token and try again."
-            )
-
-            raise falcon.HTTPUnauthorized(
-                "Authentication required", description, challenges
-            )
\ No newline at end of file
+            with timed(req, "auth"):
+                req.context.token = self.verify(id_token)
+
+        except self._revoked_errors:
+            raise self._revoked_token()
+
+        except Exception:
+            raise self._invalid_token()
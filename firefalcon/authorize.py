@@ -1,11 +1,17 @@
 import falcon
 
+from .instrumentation import timed
+
 
 class Authorize(object):
     def __init__(self, responder=None):
         self._responder = responder
 
     def __call__(self, req, resp, resource, params):
+        with timed(req, "authz"):
+            self.check(req, resource)
+
+    def check(self, req, resource):
         if resource.allowed is None:
             return
         
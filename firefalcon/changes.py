@@ -0,0 +1,199 @@
+"""Shared Firestore change feeds streamed as Server-Sent Events.
+
+A :class:`ChangeFeed` holds a single ``on_snapshot`` listener for one query
+and fans every change out to its subscribers. Each change is encoded once,
+so Firestore reads and serialization scale with the number of changes, not
+with the number of connected clients.
+
+Events are ``added``, ``modified`` and ``removed``. Every event carries an
+``id`` that clients send back as ``Last-Event-ID`` when reconnecting; the
+feed replays the missed events from its history, or sends ``reset``
+followed by the current documents when the id is too old. A subscriber
+that falls ``queue_size`` events behind is disconnected instead of
+buffering without bound, and resumes the same way.
+"""
+
+import collections
+import itertools
+import queue
+import threading
+import time
+
+SSE_MEDIA_TYPE = "text/event-stream"
+KEEPALIVE = b": keepalive\n\n"
+
+# Event ids are unique across feeds and, being seeded from the clock, across
+# restarts, so a Last-Event-ID from a closed feed cannot match a newer one.
+_event_ids = itertools.count(int(time.time() * 1000))
+
+
+def format_event(event, data, event_id=None):
+    """Encode one Server-Sent Event from an event name and JSON bytes."""
+    head = b"" if event_id is None else b"id: %d\n" % event_id
+    return head + b"event: " + event.encode() + b"\ndata: " + data + b"\n\n"
+
+
+class Subscription:
+    """One client's bounded queue of encoded events."""
+
+    def __init__(self, replay, queue_size):
+        self.replay = replay
+        self.queue = queue.Queue(queue_size)
+        self.overflowed = False
+
+    def push(self, chunk):
+        if self.overflowed:
+            return
+        try:
+            self.queue.put_nowait(chunk)
+        except queue.Full:
+            self.overflowed = True
+
+    def events(self, heartbeat=15):
+        """Yield encoded events, sending a keepalive comment when idle.
+
+        The first chunk is available immediately. Stops once the subscriber
+        has overflowed and drained its queue.
+        """
+        yield b"".join(self.replay) if self.replay else KEEPALIVE
+        self.replay = None
+
+        while True:
+            try:
+                yield self.queue.get(timeout=heartbeat)
+            except queue.Empty:
+                if self.overflowed:
+                    return
+                yield KEEPALIVE
+
+
+class ChangeFeed:
+    """Fan out the changes of one Firestore query to many subscribers.
+
+    ``encode(doc, kind)`` turns a document snapshot and its change kind
+    (``"added"``, ``"modified"`` or ``"removed"``) into an ``(event, data)``
+    pair, ``data`` being JSON bytes.
+    """
+
+    def __init__(self, query, encode, history=1000):
+        self._encode = encode
+        self._lock = threading.Lock()
+        self._ready = threading.Event()
+        self._last_id = 0
+        self._history = collections.deque(maxlen=history)
+        self._documents = {}
+        self._subscribers = set()
+        self._watch = query.on_snapshot(self._on_snapshot)
+
+    def _on_snapshot(self, docs, changes, read_time):
+        with self._lock:
+            for change in changes:
+                doc = change.document
+                kind = change.type.name.lower()
+                event, data = self._encode(doc, kind)
+
+                if kind == "removed":
+                    self._documents.pop(doc.id, None)
+                else:
+                    replay_event = "added" if event == "modified" else event
+                    self._documents[doc.id] = (replay_event, data)
+
+                self._last_id = next(_event_ids)
+                chunk = format_event(event, data, self._last_id)
+                self._history.append((self._last_id, chunk))
+                for subscription in self._subscribers:
+                    subscription.push(chunk)
+
+        self._ready.set()
+
+    def _replay(self, last_event_id):
+        if last_event_id is not None:
+            oldest = self._history[0][0] if self._history else self._last_id + 1
+            if oldest - 1 <= last_event_id <= self._last_id:
+                return [
+                    chunk
+                    for event_id, chunk in self._history
+                    if event_id > last_event_id
+                ]
+
+        replay = [] if last_event_id is None else [format_event("reset", b"{}")]
+        for event, data in self._documents.values():
+            replay.append(format_event(event, data))
+        # Only the last event carries an id, so a client interrupted during
+        # the replay starts over instead of resuming halfway through it.
+        replay.append(format_event("sync", b"{}", self._last_id))
+        return replay
+
+    def subscribe(self, last_event_id=None, queue_size=1000, timeout=10):
+        """Return a :class:`Subscription` starting after ``last_event_id``.
+
+        Waits up to ``timeout`` seconds for the listener's first snapshot.
+        """
+        self._ready.wait(timeout)
+        with self._lock:
+            subscription = Subscription(self._replay(last_event_id), queue_size)
+            self._subscribers.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            self._subscribers.discard(subscription)
+
+    def close(self):
+        self._watch.unsubscribe()
+
+
+class ChangeFeeds:
+    """Registry sharing one :class:`ChangeFeed` per query key.
+
+    A feed's listener is opened by its first subscriber and closed when
+    the last one leaves.
+    """
+
+    def __init__(self, history=1000, queue_size=1000, heartbeat=15):
+        self.history = history
+        self.queue_size = queue_size
+        self.heartbeat = heartbeat
+        self._feeds = {}
+        self._refs = collections.Counter()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._feeds)
+
+    def _release(self, key):
+        with self._lock:
+            self._refs[key] -= 1
+            if self._refs[key] <= 0:
+                del self._refs[key]
+                self._feeds.pop(key).close()
+
+    def subscribe(self, key, query, encode, last_event_id=None):
+        """Return a generator of encoded events for ``query``.
+
+        Closing the generator releases the subscription. Its first chunk is
+        available without waiting.
+        """
+        with self._lock:
+            feed = self._feeds.get(key)
+            if feed is None:
+                feed = self._feeds[key] = ChangeFeed(query, encode, self.history)
+            self._refs[key] += 1
+
+        try:
+            subscription = feed.subscribe(last_event_id, self.queue_size)
+        except BaseException:
+            self._release(key)
+            raise
+        events = self._events(key, feed, subscription)
+        # Start the generator so that closing it runs the cleanup below.
+        next(events)
+        return events
+
+    def _events(self, key, feed, subscription):
+        try:
+            yield
+            yield from subscription.events(self.heartbeat)
+        finally:
+            feed.unsubscribe(subscription)
+            self._release(key)
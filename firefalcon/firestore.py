@@ -1,12 +1,35 @@
-import json
+import itertools
 
 import falcon
 from firebase_admin.exceptions import AlreadyExistsError, FirebaseError, NotFoundError
+from google.api_core.exceptions import Conflict, GoogleAPICallError
 from pydantic import ValidationError
 
-from ._schemas import BaseQuerySchema, BaseSchema
-from ._utils import create_collection_query, parse_docs
+from ._cache import TTLCache
+from ._filters import required_index
+from ._schemas import BaseQuerySchema, BaseSchema, validate_fields
+from ._utils import (
+    bulk_error,
+    count_result,
+    create_collection_query,
+    create_count_query,
+    create_watch_query,
+    create_cursor,
+    create_etag,
+    etag_matches,
+    parse_docs,
+    prepend,
+    project,
+    select_fields,
+    StreamEncoder,
+)
 from .authorize import Authorize
+from .changes import SSE_MEDIA_TYPE, ChangeFeeds
+from .instrumentation import timed
+from .media import FirestoreJSONHandler, dumps
+
+WRITE_ERRORS = (FirebaseError, GoogleAPICallError)
+READ_VALIDATION_MODES = ("full", "sampled", "trusted")
 
 
 class FirstoreBaseResource:
@@ -28,6 +51,21 @@ class FirstoreBaseResource:
         schema_patch=None,
         schema_q=None,
         allowed=None,
+        stream=False,
+        stream_chunk_size=65536,
+        doc_cache_size=0,
+        doc_cache_ttl=60,
+        count_cache_size=0,
+        count_cache_ttl=10,
+        bulk_batch_size=500,
+        bulk_max_items=10000,
+        read_validation="full",
+        read_sample_rate=100,
+        indexes=(),
+        relationships=None,
+        change_history=1000,
+        change_queue_size=1000,
+        change_heartbeat=15,
     ):
         self._db = db
         self._db_path = db_path
@@ -38,6 +76,24 @@ class FirstoreBaseResource:
         self._schema_put = schema_put
         self._schema_patch = schema_patch
         self._schema_q = schema_q
+        self._stream = stream
+        self._stream_chunk_size = stream_chunk_size
+        self.doc_cache = TTLCache(maxsize=doc_cache_size, ttl=doc_cache_ttl)
+        self.count_cache = TTLCache(maxsize=count_cache_size, ttl=count_cache_ttl)
+        self._bulk_batch_size = bulk_batch_size
+        self._bulk_max_items = bulk_max_items
+        if read_validation not in READ_VALIDATION_MODES:
+            raise ValueError(f"read_validation must be one of {READ_VALIDATION_MODES}")
+        self._read_validation = read_validation
+        self._read_sample_rate = read_sample_rate
+        self._read_counter = itertools.count()
+        if indexes is not None:
+            indexes = frozenset(frozenset(fields) for fields in indexes)
+        self._indexes = indexes
+        self._relationships = relationships or {}
+        self.change_feeds = ChangeFeeds(
+            change_history, change_queue_size, change_heartbeat
+        )
         self.allowed = None
 
     def get_resource_link(self, req):
@@ -45,6 +101,19 @@ class FirstoreBaseResource:
             return req.uri
         return req.forwarded_uri
 
+    def get_page_link(self, req, cursor):
+        link = self.get_resource_link(req).split("?")[0]
+        params = dict(req.params, cursor=cursor)
+        params.pop("offset", None)
+        return link + falcon.to_query_str(params)
+
+    def _not_modified(self, req, resp, etag):
+        resp.etag = etag
+        if etag_matches(req.get_header("If-None-Match"), etag):
+            resp.status = falcon.HTTP_304
+            return True
+        return False
+
     def get_db_path(self, path):
         if self._db_path is None:
             return path[1:]
@@ -74,32 +143,393 @@ class FirstoreBaseResource:
     def _validate_patch(self, data):
         return self._validate(self._schema_patch, data)
 
-    def _validate_q(self, data):
-        if self._schema_q is None:
-            return self._validate(self.base_query_schema, data)
-        return self._validate(self._schema_q, data)
-
-    @falcon.before(authorize("on_get"))
-    def on_get(self, req, resp, **kwargs):
+    def _validate_get_fields(self, data, fields):
         try:
-            db_path = self.get_db_path(req.path)
-            col_ref = self._db.collection(db_path)
+            return validate_fields(self._schema_get or self.base_schema, data, fields)
 
-            params = self._validate_q(req.params)
-            query_ref = create_collection_query(col_ref, params)
+        except self.valid_error as e:
+            title = "ValidationError"
+            description = str(e)
+            raise falcon.HTTPBadRequest(title=title, description=description)
 
-            docs = query_ref.get()
+    def _validate_q(self, data):
+        schema = self._schema_q or self.base_query_schema
+        params = self._validate(schema, data)
+        self._check_indexes(params)
+        self._check_include(params)
+        return params
+
+    def _check_include(self, params):
+        unknown = set(params.include or ()) - set(self._relationships)
+        if unknown:
+            description = f"Unknown relationships: {', '.join(sorted(unknown))}"
+            raise falcon.HTTPBadRequest(title="InvalidInclude", description=description)
+
+    def _check_indexes(self, params):
+        """Reject filtered queries needing a composite index not in ``indexes``.
+
+        Pass ``indexes=None`` to leave the check to Firestore.
+        """
+        if self._indexes is None or not params.where:
+            return
+
+        index = required_index(params.where, params.order_by)
+        if index is not None and index not in self._indexes:
+            fields = ", ".join(sorted(index))
+            description = (
+                f"This query needs a composite index on ({fields}). "
+                "Create it in Firestore and list it in the resource's indexes."
+            )
+            raise falcon.HTTPBadRequest(title="IndexRequired", description=description)
+
+    def _read_attributes(self, data, fields=None, as_model=False):
+        """Return document data as response attributes.
+
+        In ``"full"`` mode every document is validated with the get schema.
+        ``"sampled"`` validates one document in ``read_sample_rate`` and
+        ``"trusted"`` returns stored data as-is, relying on it having been
+        validated on write. With ``fields``, only the projected fields are
+        validated. ``as_model`` skips converting validated models to dicts,
+        for serializers that encode them directly.
+        """
+        if self._read_validation == "trusted":
+            return data
+
+        if self._read_validation == "sampled":
+            if next(self._read_counter) % self._read_sample_rate:
+                return data
+
+        if fields:
+            return self._validate_get_fields(data, fields)
+
+        validated = self._validate_get(data)
+        return validated if as_model else validated.dict()
+
+    def _doc_resource(self, doc, fields=None, as_model=False):
+        return {
+            "id": doc.id,
+            "type": self._resource_type,
+            "attributes": self._read_attributes(doc.to_dict(), fields, as_model),
+        }
+
+    def _encodes_models(self, resp):
+        """Whether the response media handler can encode models directly."""
+        handler = resp.options.media_handlers.get(falcon.MEDIA_JSON)
+        return isinstance(handler, FirestoreJSONHandler)
+
+    def _query_key(self, db_path, params):
+        return (db_path, tuple(params.where or ()))
+
+    def _count(self, req, col_ref, db_path, params):
+        """Return ``meta`` holding the total number of matching documents.
+
+        Totals come from a single count aggregation, cached for
+        ``count_cache_ttl`` seconds when ``count_cache_size`` is set, so they
+        can lag behind writes by that long.
+        """
+        key = self._query_key(db_path, params)
+        total = self.count_cache.get(key)
+
+        if total is None:
+            with timed(req, "firestore"):
+                total = count_result(create_count_query(col_ref, params).get())
+            self.count_cache.set(key, total)
+
+        return {"total": total}
+
+    def _count_response(self, req, resp, meta):
+        resp.status = falcon.HTTP_200
+        resp.media = {"links": {"self": self.get_resource_link(req)}, "meta": meta}
+
+    def _stream_collection(self, req, docs, params, meta=None):
+        """Yield the collection document in chunks as documents arrive.
+
+        The first chunk is flushed right after the first document to keep
+        time-to-first-byte low. Headers are already sent by the time later
+        documents are read, so an error past the first document aborts the
+        response instead of turning into an error status.
+        """
+        encoder = StreamEncoder(self._stream_chunk_size)
+        doc = None
+
+        for doc in docs:
+            resource = self._doc_resource(doc, params.fields, as_model=True)
+            chunk = encoder.add(self._dumps(resource))
+            if chunk:
+                yield chunk
+
+        links = self._collection_links(req, params, doc, encoder.count)
+        yield encoder.finish(
+            self._dumps(links), None if meta is None else self._dumps(meta)
+        )
+
+    def _dumps(self, obj):
+        return dumps(obj)
+
+    def _collection_links(self, req, params, last_doc, count):
+        links = {"self": self.get_resource_link(req)}
+        if count == params.limit:
+            links["next"] = self.get_page_link(req, create_cursor(last_doc, params))
+        return links
+
+    def _collection_response(self, req, resp, params, docs, meta=None):
+        last_doc = docs[-1] if docs else None
+        links = self._collection_links(req, params, last_doc, len(docs))
+
+        with timed(req, "validate"):
+            as_model = self._encodes_models(resp)
             validated = [
+                self._doc_resource(doc, params.fields, as_model) for doc in docs
+            ]
+
+        resp.status = falcon.HTTP_200
+        resp.media = {"links": links, "data": validated}
+        if meta is not None:
+            resp.media["meta"] = meta
+
+    def _load_doc(self, req, resp, db_path, doc, fields=None):
+        """Validate and cache a fetched document.
+
+        Returns ``None`` when the request's If-None-Match already matches, in
+        which case the document is neither validated nor cached. Projected
+        reads are not cached.
+        """
+        if not doc.exists:
+            raise falcon.HTTPNotFound()
+
+        etag = create_etag(doc.update_time)
+        if self._not_modified(req, resp, etag):
+            return None
+
+        with timed(req, "validate"):
+            as_model = self._encodes_models(resp)
+            attributes = self._read_attributes(doc.to_dict(), fields, as_model)
+
+        entry = (doc.id, etag, attributes)
+        if not fields:
+            self.doc_cache.set(db_path, entry)
+        return entry
+
+    def _doc_response(self, req, resp, entry, fields=None):
+        doc_id, etag, attributes = entry
+        if self._not_modified(req, resp, etag):
+            return
+
+        if fields:
+            attributes = project(attributes, fields)
+
+        resp.status = falcon.HTTP_200
+        resp.append_header("Location", self.get_resource_link(req))
+        resp.media = {
+            "links": {
+                "self": self.get_resource_link(req),
+                "data": {"id": doc_id, "attributes": attributes},
+            }
+        }
+
+    def _many_refs(self, col_ref, db_path, params):
+        """Split requested ids into cached entries and references to fetch."""
+        entries = {}
+        refs = []
+        for doc_id in params.ids:
+            # Projected reads are not cached, so they always go to Firestore.
+            entry = None if params.fields else self.doc_cache.get(f"{db_path}/{doc_id}")
+            if entry is None:
+                refs.append(col_ref.document(doc_id))
+            else:
+                entries[doc_id] = entry
+        return entries, refs
+
+    def _load_many(self, req, resp, db_path, docs, fields=None):
+        """Validate and cache documents fetched by ``get_all``."""
+        entries = {}
+        with timed(req, "validate"):
+            as_model = self._encodes_models(resp)
+            for doc in docs:
+                if not doc.exists:
+                    continue
+                attributes = self._read_attributes(doc.to_dict(), fields, as_model)
+                entry = (doc.id, create_etag(doc.update_time), attributes)
+                if not fields:
+                    self.doc_cache.set(f"{db_path}/{doc.id}", entry)
+                entries[doc.id] = entry
+        return entries
+
+    def _many_response(self, req, resp, params, entries):
+        data = []
+        missing = []
+        for doc_id in params.ids:
+            if doc_id not in entries:
+                missing.append(doc_id)
+                continue
+            data.append(
                 {
-                    "id": doc.id,
+                    "id": doc_id,
                     "type": self._resource_type,
-                    "attributes": self._validate_get(doc.to_dict()).dict(),
+                    "attributes": entries[doc_id][2],
                 }
-                for doc in docs
-            ]
+            )
+
+        resp.status = falcon.HTTP_200
+        resp.media = {
+            "links": {"self": self.get_resource_link(req)},
+            "data": data,
+            "meta": {"missing": missing},
+        }
+
+    def _get_many(self, req, resp, col_ref, db_path, params):
+        """Fetch every document in ``ids`` with a single ``get_all`` call."""
+        entries, refs = self._many_refs(col_ref, db_path, params)
+        if refs:
+            field_paths = select_fields(params, params.include or ())
+            with timed(req, "firestore"):
+                docs = list(self._db.get_all(refs, field_paths=field_paths))
+            entries.update(self._load_many(req, resp, db_path, docs, params.fields))
+        self._many_response(req, resp, params, entries)
+
+    def _include_refs(self, data, include):
+        """Return references to the related documents named in ``include``.
+
+        Relationship fields are top-level attributes holding a document id,
+        a document reference or a list of either.
+        """
+        refs = {}
+        for resource in data:
+            related = project(resource["attributes"], include)
+            for name, values in related.items():
+                collection = self._relationships[name]
+                if values is None:
+                    continue
+                if not isinstance(values, (list, tuple)):
+                    values = [values]
+                for value in values:
+                    if isinstance(value, str):
+                        ref = self._db.collection(collection).document(value)
+                    elif hasattr(value, "path"):
+                        ref = value
+                    else:
+                        continue
+                    refs[ref.path] = ref
+        return list(refs.values())
+
+    def _included_resources(self, docs):
+        return [
+            {
+                "id": doc.id,
+                "type": doc.reference.parent.id,
+                "attributes": doc.to_dict(),
+            }
+            for doc in docs
+            if doc.exists
+        ]
+
+    def _include(self, req, resp, params):
+        """Add the related documents in ``include`` using one ``get_all``."""
+        refs = self._include_refs(resp.media["data"], params.include)
+        docs = []
+        if refs:
+            with timed(req, "firestore"):
+                docs = list(self._db.get_all(refs))
+        resp.media["included"] = self._included_resources(docs)
+
+    def _encode_change(self, doc, kind):
+        if kind == "removed":
+            return kind, self._dumps({"id": doc.id, "type": self._resource_type})
 
-            resp.status = falcon.HTTP_200
-            resp.media = {"links": self.get_resource_link(req), "data": validated}
+        try:
+            return kind, self._dumps(self._doc_resource(doc, as_model=True))
+        except falcon.HTTPBadRequest as e:
+            error = {"title": e.title, "detail": e.description}
+            resource = {"id": doc.id, "type": self._resource_type, "errors": [error]}
+            return "invalid", self._dumps(resource)
+
+    def _changes(self, req, resp, col_ref, db_path, params):
+        """Stream changes to the matching documents as Server-Sent Events.
+
+        Clients asking for ``text/event-stream`` share one snapshot listener
+        per filtered query. Pagination, ordering and projection parameters
+        do not apply to the feed.
+        """
+        last_event_id = req.get_header("Last-Event-ID")
+        if last_event_id is not None:
+            try:
+                last_event_id = int(last_event_id)
+            except ValueError:
+                raise falcon.HTTPBadRequest(
+                    title="InvalidHeader", description="Invalid Last-Event-ID"
+                )
+
+        resp.status = falcon.HTTP_200
+        resp.content_type = SSE_MEDIA_TYPE
+        resp.cache_control = ["no-cache"]
+        resp.stream = self.change_feeds.subscribe(
+            self._query_key(db_path, params),
+            create_watch_query(col_ref, params),
+            self._encode_change,
+            last_event_id,
+        )
+
+    def _write_response(self, req, resp, status, doc_id, attributes):
+        resp.status = status
+        resp.append_header("Location", self.get_resource_link(req))
+        resp.media = {
+            "data": {
+                "id": doc_id,
+                "type": self._resource_type,
+                "attributes": attributes,
+            },
+            "links": {"self": self.get_resource_link(req)},
+        }
+
+    @falcon.before(authorize("on_get"))
+    def on_get(self, req, resp, **kwargs):
+        try:
+            db_path = self.get_db_path(req.path)
+            col_ref = self._db.collection(db_path)
+
+            with timed(req, "validate"):
+                params = self._validate_q(req.params)
+
+            if req.client_prefers((falcon.MEDIA_JSON, SSE_MEDIA_TYPE)) == (
+                SSE_MEDIA_TYPE
+            ):
+                self._changes(req, resp, col_ref, db_path, params)
+                return
+
+            if params.ids is not None:
+                self._get_many(req, resp, col_ref, db_path, params)
+                if params.include:
+                    self._include(req, resp, params)
+                return
+
+            meta = None
+            if params.count:
+                meta = self._count(req, col_ref, db_path, params)
+                if params.count == "only":
+                    self._count_response(req, resp, meta)
+                    return
+
+            query_ref = create_collection_query(
+                col_ref, params, extra_fields=params.include or ()
+            )
+
+            # Included documents are resolved after the page, so buffer it.
+            if self._stream and not params.include:
+                chunks = self._stream_collection(req, query_ref.stream(), params, meta)
+                # Running up to the first chunk here lets query and validation
+                # errors on the first document still produce an error response.
+                first = next(chunks)
+
+                resp.status = falcon.HTTP_200
+                resp.content_type = falcon.MEDIA_JSON
+                resp.stream = prepend(first, chunks)
+                return
+
+            with timed(req, "firestore"):
+                docs = query_ref.get()
+            self._collection_response(req, resp, params, docs, meta)
+            if params.include:
+                self._include(req, resp, params)
 
         except FirebaseError as e:
             raise falcon.HTTPBadRequest(code=e.code, description=e.message)
@@ -108,51 +538,131 @@ class FirstoreBaseResource:
     def on_get_doc(self, req, resp, **kwargs):
         try:
             db_path = self.get_db_path(req.path)
-            doc_ref = self._db.document(db_path)
+            with timed(req, "validate"):
+                fields = self._validate_q(req.params).fields
+            entry = self.doc_cache.get(db_path)
 
-            doc = doc_ref.get()
-            validated = self._validate_get(doc.to_dict())
+            if entry is None:
+                with timed(req, "firestore"):
+                    doc = self._db.document(db_path).get(field_paths=fields)
+                entry = self._load_doc(req, resp, db_path, doc, fields)
+                if entry is None:
+                    return
 
-            resp.status = falcon.HTTP_200
-            resp.append_header("Location", self.get_resource_link(req))
-            resp.media = {
-                "links": {
-                    "self": self.get_resource_link(req),
-                    "data": {"id": doc_ref.id, "attributes": validated.dict()},
-                }
-            }
+            self._doc_response(req, resp, entry, fields)
 
         except FirebaseError as e:
             raise falcon.HTTPBadRequest(code=e.code, description=e.message)
 
+    def _prepare_post(self, col_ref, validated):
+        valid_dict = validated.dict()
+
+        if hasattr(validated, "id"):
+            doc_ref = col_ref.document(validated.id)
+            del valid_dict["id"]
+
+        else:
+            doc_ref = col_ref.document()
+
+        return doc_ref, valid_dict
+
+    def _bulk_prepare(self, col_ref, items):
+        """Validate bulk items and split the writes into batch-sized chunks."""
+        if len(items) > self._bulk_max_items:
+            description = (
+                f"At most {self._bulk_max_items} items can be created at once."
+            )
+            raise falcon.HTTPBadRequest(title="Too many items", description=description)
+
+        errors = []
+        pending = []
+
+        for index, item in enumerate(items):
+            try:
+                validated = self._validate_post(item)
+            except falcon.HTTPBadRequest as e:
+                errors.append(bulk_error(index, e.title, e.description))
+                continue
+
+            doc_ref, valid_dict = self._prepare_post(col_ref, validated)
+            pending.append((index, doc_ref, valid_dict))
+
+        size = self._bulk_batch_size
+        chunks = [
+            pending[start : start + size] for start in range(0, len(pending), size)
+        ]
+        return chunks, errors
+
+    def _bulk_batch(self, chunk):
+        batch = self._db.batch()
+        for _, doc_ref, valid_dict in chunk:
+            batch.create(doc_ref, valid_dict)
+        return batch
+
+    def _bulk_failed(self, chunk, e):
+        title = type(e).__name__
+        status = "409" if isinstance(e, (AlreadyExistsError, Conflict)) else "400"
+        return [bulk_error(index, title, e.message, status) for index, _, _ in chunk]
+
+    def _bulk_created(self, chunk):
+        return [
+            {
+                "id": doc_ref.id,
+                "type": self._resource_type,
+                "attributes": valid_dict,
+                "meta": {"index": index},
+            }
+            for index, doc_ref, valid_dict in chunk
+        ]
+
+    def _bulk_response(self, req, resp, data, errors):
+        resp.status = falcon.HTTP_207 if errors else falcon.HTTP_201
+        resp.media = {
+            "data": data,
+            "errors": sorted(errors, key=lambda error: error["meta"]["index"]),
+            "links": {"self": self.get_resource_link(req)},
+        }
+
+    def _bulk_create(self, req, resp, col_ref, items):
+        """Create many documents through chunked write batches.
+
+        Each chunk of ``bulk_batch_size`` writes is committed atomically, so
+        a failed commit is reported against every item in that chunk while
+        other chunks still go through.
+        """
+        with timed(req, "validate"):
+            chunks, errors = self._bulk_prepare(col_ref, items)
+        data = []
+
+        for chunk in chunks:
+            try:
+                with timed(req, "firestore"):
+                    self._bulk_batch(chunk).commit()
+            except WRITE_ERRORS as e:
+                errors.extend(self._bulk_failed(chunk, e))
+            else:
+                data.extend(self._bulk_created(chunk))
+
+        self._bulk_response(req, resp, data, errors)
+
     @falcon.before(authorize("on_post"))
     def on_post(self, req, resp, **kwargs):
         try:
-            validated = self._validate_post(req.media)
-            valid_dict = validated.dict()
-
             db_path = self.get_db_path(req.path)
             col_ref = self._db.collection(db_path)
 
-            if hasattr(validated, "id"):
-                doc_ref = col_ref.document(validated.id)
-                del valid_dict["id"]
-                doc_ref.create(valid_dict)
+            if isinstance(req.media, list):
+                self._bulk_create(req, resp, col_ref, req.media)
+                return
 
-            else:
-                doc_ref = col_ref.document()
+            with timed(req, "validate"):
+                validated = self._validate_post(req.media)
+            doc_ref, valid_dict = self._prepare_post(col_ref, validated)
+
+            with timed(req, "firestore"):
                 doc_ref.create(valid_dict)
 
-            resp.status = falcon.HTTP_201
-            resp.append_header("Location", self.get_resource_link(req))
-            resp.media = {
-                "data": {
-                    "id": doc_ref.id,
-                    "type": self._resource_type,
-                    "attributes": valid_dict,
-                },
-                "links": {"self": self.get_resource_link(req)},
-            }
+            self._write_response(req, resp, falcon.HTTP_201, doc_ref.id, valid_dict)
 
         except AlreadyExistsError as e:
             raise falcon.HTTPConflict(code=e.code, description=e.message)
@@ -163,23 +673,18 @@ class FirstoreBaseResource:
     @falcon.before(authorize("on_put_doc"))
     def on_put_doc(self, req, resp, **kwargs):
         try:
-            validated = self._validate_put(req.media)
+            with timed(req, "validate"):
+                validated = self._validate_put(req.media)
 
             db_path = self.get_db_path(req.path)
             doc_ref = self._db.document(db_path)
 
-            doc_ref.set(validated.dict())
+            attributes = validated.dict()
+            with timed(req, "firestore"):
+                doc_ref.set(attributes)
+            self.doc_cache.pop(db_path)
 
-            resp.status = falcon.HTTP_200
-            resp.append_header("Location", self.get_resource_link(req))
-            resp.media = {
-                "data": {
-                    "id": doc_ref.id,
-                    "type": self._resource_type,
-                    "attributes": validated.dict(),
-                },
-                "links": {"self": self.get_resource_link(req)},
-            }
+            self._write_response(req, resp, falcon.HTTP_200, doc_ref.id, attributes)
 
         except FirebaseError as e:
             raise falcon.HTTPBadRequest(code=e.code, description=e.message)
@@ -187,23 +692,18 @@ class FirstoreBaseResource:
     @falcon.before(authorize("on_put_doc"))
     def on_patch_doc(self, req, resp, **kwargs):
         try:
-            validated = self._validate_patch(req.media)
+            with timed(req, "validate"):
+                validated = self._validate_patch(req.media)
 
             db_path = self.get_db_path(req.path)
             doc_ref = self._db.document(db_path)
 
-            doc_ref.update(validated.dict())
-    
-            resp.status = falcon.HTTP_200
-            resp.append_header("Location", self.get_resource_link(req))
-            resp.media = {
-                "data": {
-                    "id": doc_ref.id,
-                    "type": self._resource_type,
-                    "attributes": validated.dict(),
-                },
-                "links": {"self": self.get_resource_link(req)},
-            }
+            attributes = validated.dict()
+            with timed(req, "firestore"):
+                doc_ref.update(attributes)
+            self.doc_cache.pop(db_path)
+
+            self._write_response(req, resp, falcon.HTTP_200, doc_ref.id, attributes)
 
         except NotFoundError as e:
             raise falcon.HTTPNotFound(code=e.code, description=e.message)
@@ -217,7 +717,9 @@ class FirstoreBaseResource:
             db_path = self.get_db_path(req.path)
             doc_ref = self._db.document(db_path)
 
-            doc_ref.delete()
+            with timed(req, "firestore"):
+                doc_ref.delete()
+            self.doc_cache.pop(db_path)
 
         except NotFoundError as e:
             raise falcon.HTTPNotFound(code=e.code, description=e.message)
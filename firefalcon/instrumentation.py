@@ -0,0 +1,186 @@
+"""Per-request phase timing for FireFalcon endpoints.
+
+Add :class:`Instrumentation` as the *first* middleware component so its
+timer exists before authentication runs::
+
+    sink = InMemorySink()
+    api = falcon.App(middleware=[Instrumentation(sink), Authentication(auth)])
+
+FireFalcon's middleware, hooks and resources time their work through
+:func:`timed`, which costs a single attribute lookup when instrumentation
+is not installed. Recorded phases are ``auth``, ``authz``, ``validate``,
+``firestore`` and ``serialize``, plus ``total`` for the whole request.
+"""
+
+import bisect
+import threading
+import time
+
+DEFAULT_BUCKETS = (0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+
+
+class _NullPhase:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+_NULL_PHASE = _NullPhase()
+
+
+class _Phase:
+    __slots__ = ("_timer", "_name", "_start")
+
+    def __init__(self, timer, name):
+        self._timer = timer
+        self._name = name
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._timer.add(self._name, time.perf_counter() - self._start)
+        return False
+
+
+class RequestTimer:
+    """Accumulate seconds spent in each phase of a single request."""
+
+    def __init__(self):
+        self.start = time.perf_counter()
+        self.phases = {}
+
+    def phase(self, name):
+        return _Phase(self, name)
+
+    def add(self, name, seconds):
+        self.phases[name] = self.phases.get(name, 0.0) + seconds
+
+
+def timed(req, phase):
+    """Return a context manager timing ``phase`` for ``req``, if instrumented."""
+    timer = getattr(req.context, "timer", None)
+    if timer is None:
+        return _NULL_PHASE
+    return timer.phase(phase)
+
+
+class Histogram:
+    """Bucketed latency histogram with bucket bounds in milliseconds."""
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, milliseconds):
+        self.counts[bisect.bisect_left(self.buckets, milliseconds)] += 1
+        self.count += 1
+        self.sum += milliseconds
+
+    def quantile(self, q):
+        """Return the upper bucket bound containing the ``q`` quantile."""
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for bound, count in zip(self.buckets + (float("inf"),), self.counts):
+            seen += count
+            if seen >= rank:
+                return bound
+        return float("inf")
+
+
+class InMemorySink:
+    """Metrics sink keeping one :class:`Histogram` per route and phase.
+
+    Any object with an ``observe(route, phase, seconds)`` method can be
+    used as a sink instead, e.g. to forward to Prometheus or StatsD.
+    """
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = buckets
+        self.histograms = {}
+        self._lock = threading.Lock()
+
+    def observe(self, route, phase, seconds):
+        with self._lock:
+            histogram = self.histograms.get((route, phase))
+            if histogram is None:
+                histogram = self.histograms[(route, phase)] = Histogram(self.buckets)
+            histogram.observe(seconds * 1000)
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                key: {
+                    "count": histogram.count,
+                    "mean_ms": histogram.sum / histogram.count,
+                    "p50_ms": histogram.quantile(0.5),
+                    "p99_ms": histogram.quantile(0.99),
+                }
+                for key, histogram in self.histograms.items()
+            }
+
+
+class Instrumentation:
+    """Middleware timing each request phase.
+
+    Emits a ``Server-Timing`` header (unless ``server_timing`` is False) and
+    reports every phase to ``sink`` keyed by the matched route template.
+    Media responses are serialized here so that the ``serialize`` phase can
+    be measured; Falcon reuses the rendered body.
+    """
+
+    def __init__(self, sink=None, server_timing=True):
+        self.sink = sink
+        self.server_timing = server_timing
+
+    def process_request(self, req, resp):
+        req.context.timer = RequestTimer()
+
+    def _report(self, req, resp, timer):
+        timer.add("total", time.perf_counter() - timer.start)
+
+        if self.server_timing:
+            resp.set_header(
+                "Server-Timing",
+                ", ".join(
+                    f"{name};dur={seconds * 1000:.3f}"
+                    for name, seconds in timer.phases.items()
+                ),
+            )
+
+        if self.sink is not None:
+            route = req.uri_template or req.path
+            for name, seconds in timer.phases.items():
+                self.sink.observe(route, name, seconds)
+
+    def process_response(self, req, resp, resource, req_succeeded):
+        timer = getattr(req.context, "timer", None)
+        if timer is None:
+            return
+
+        if resp.stream is None:
+            with timer.phase("serialize"):
+                resp.render_body()
+
+        self._report(req, resp, timer)
+
+    async def process_request_async(self, req, resp):
+        self.process_request(req, resp)
+
+    async def process_response_async(self, req, resp, resource, req_succeeded):
+        timer = getattr(req.context, "timer", None)
+        if timer is None:
+            return
+
+        if resp.stream is None:
+            with timer.phase("serialize"):
+                await resp.render_body()
+
+        self._report(req, resp, timer)
@@ -0,0 +1,83 @@
+"""JSON media handling that understands Firestore and pydantic values.
+
+``orjson`` is used when it is installed, with a fallback to the stdlib
+``json`` module. Both encode ``DatetimeWithNanoseconds`` and other
+datetimes as RFC 3339 strings, ``GeoPoint`` as latitude/longitude objects,
+document references as their path, ``bytes`` as base64 and pydantic models
+as objects, so responders can hand raw Firestore data or validated models
+straight to ``resp.media``::
+
+    api = falcon.App()
+    install_media_handlers(api)
+"""
+
+import base64
+import datetime
+import json
+
+import falcon
+from falcon.media import JSONHandler
+from google.cloud.firestore_v1 import GeoPoint
+from pydantic import BaseModel
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+
+def default(obj):
+    """Encode values the JSON serializer does not handle natively."""
+    if isinstance(obj, BaseModel):
+        # Shallow conversion; nested models come back through here.
+        return dict(obj)
+    if isinstance(obj, datetime.datetime):
+        rfc3339 = getattr(obj, "rfc3339", None)
+        return rfc3339() if rfc3339 is not None else obj.isoformat()
+    if isinstance(obj, (datetime.date, datetime.time)):
+        return obj.isoformat()
+    if isinstance(obj, GeoPoint):
+        return {"latitude": obj.latitude, "longitude": obj.longitude}
+    if isinstance(obj, bytes):
+        return base64.b64encode(obj).decode()
+    if isinstance(obj, (set, frozenset, tuple)):
+        return list(obj)
+
+    # DocumentReference, AsyncDocumentReference and compatible fakes.
+    path = getattr(obj, "path", None)
+    if isinstance(path, str):
+        return path
+
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+if orjson is not None:
+
+    def dumps(obj):
+        return orjson.dumps(obj, default=default)
+
+    loads = orjson.loads
+
+else:  # pragma: no cover
+
+    def dumps(obj):
+        return json.dumps(
+            obj, default=default, ensure_ascii=False, separators=(",", ":")
+        ).encode()
+
+    loads = json.loads
+
+
+class FirestoreJSONHandler(JSONHandler):
+    """Falcon JSON media handler using :func:`dumps` and :func:`loads`."""
+
+    def __init__(self):
+        super().__init__(dumps=dumps, loads=loads)
+
+
+def install_media_handlers(app, handler=None):
+    """Register ``handler`` for JSON requests and responses on ``app``."""
+    handler = handler or FirestoreJSONHandler()
+    app.req_options.media_handlers[falcon.MEDIA_JSON] = handler
+    app.resp_options.media_handlers[falcon.MEDIA_JSON] = handler
+    return handler
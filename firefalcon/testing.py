@@ -0,0 +1,506 @@
+"""An in-memory stand-in for the parts of the Firestore client FireFalcon uses.
+
+``InMemoryFirestore`` mimics ``db.collection``, ``db.document``, queries,
+count aggregations, snapshot listeners, write batches and ``get_all``
+closely enough to drive
+:class:`~firefalcon.firestore.FirstoreBaseResource` offline, in tests and
+benchmarks. It keeps no indexes and does not enforce Firestore's query
+restrictions.
+"""
+
+import copy
+import datetime
+import functools
+import itertools
+import threading
+import uuid
+
+from google.api_core.exceptions import AlreadyExists, NotFound
+from google.cloud.firestore_v1.aggregation import AggregationResult
+from google.cloud.firestore_v1.watch import ChangeType, DocumentChange
+
+from ._utils import project
+
+ASCENDING = "ASCENDING"
+DESCENDING = "DESCENDING"
+
+
+def _split(path):
+    parts = path.strip("/").split("/")
+    return "/".join(parts[:-1]), parts[-1]
+
+
+def _get_path(data, field_path):
+    value = data
+    for part in field_path.split("."):
+        value = value[part]
+    return value
+
+
+def _type_rank(value):
+    if value is None:
+        return 0
+    if isinstance(value, bool):
+        return 1
+    if isinstance(value, (int, float)):
+        return 2
+    if isinstance(value, datetime.datetime):
+        return 3
+    if isinstance(value, str):
+        return 4
+    if isinstance(value, bytes):
+        return 5
+    if isinstance(value, list):
+        return 8
+    return 9
+
+
+def _compare(a, b):
+    rank_a, rank_b = _type_rank(a), _type_rank(b)
+    if rank_a != rank_b:
+        return -1 if rank_a < rank_b else 1
+    if rank_a == 9 or a == b:
+        return 0
+    return -1 if a < b else 1
+
+
+def _matches(op, value, operand):
+    if op == "==":
+        return _compare(value, operand) == 0
+    if op == "!=":
+        return value is not None and _compare(value, operand) != 0
+    if op == "in":
+        return any(_compare(value, item) == 0 for item in operand)
+    if op == "not-in":
+        return value is not None and all(_compare(value, item) for item in operand)
+    if op == "array_contains":
+        return isinstance(value, list) and operand in value
+    if op == "array_contains_any":
+        return isinstance(value, list) and any(item in value for item in operand)
+
+    if _type_rank(value) != _type_rank(operand):
+        return False
+    result = _compare(value, operand)
+    return {
+        "<": result < 0,
+        "<=": result <= 0,
+        ">": result > 0,
+        ">=": result >= 0,
+    }[op]
+
+
+class DocumentSnapshot:
+    def __init__(self, reference, data, create_time=None, update_time=None):
+        self.reference = reference
+        self._data = data
+        self.create_time = create_time
+        self.update_time = update_time
+
+    @property
+    def id(self):
+        return self.reference.id
+
+    @property
+    def exists(self):
+        return self._data is not None
+
+    def to_dict(self):
+        return copy.deepcopy(self._data)
+
+    def get(self, field_path):
+        return copy.deepcopy(_get_path(self._data, field_path))
+
+
+class DocumentReference:
+    def __init__(self, client, path):
+        self._client = client
+        self.path = path.strip("/")
+        self._parent_path, self.id = _split(self.path)
+
+    @property
+    def parent(self):
+        return CollectionReference(self._client, self._parent_path)
+
+    def __eq__(self, other):
+        return isinstance(other, DocumentReference) and other.path == self.path
+
+    def __hash__(self):
+        return hash(self.path)
+
+    def __deepcopy__(self, memo):
+        # References are immutable and stored in documents as values.
+        return self
+
+    def collection(self, collection_id):
+        return CollectionReference(self._client, f"{self.path}/{collection_id}")
+
+    def get(self, field_paths=None):
+        return self._client._snapshot(self, field_paths)
+
+    def create(self, document_data):
+        batch = self._client.batch()
+        batch.create(self, document_data)
+        batch.commit()
+
+    def set(self, document_data, merge=False):
+        batch = self._client.batch()
+        batch.set(self, document_data, merge=merge)
+        batch.commit()
+
+    def update(self, field_updates):
+        batch = self._client.batch()
+        batch.update(self, field_updates)
+        batch.commit()
+
+    def delete(self):
+        batch = self._client.batch()
+        batch.delete(self)
+        batch.commit()
+
+
+class Query:
+    def __init__(
+        self,
+        client,
+        path,
+        filters=(),
+        orders=(),
+        projection=None,
+        limit=None,
+        offset=0,
+        start_after=None,
+    ):
+        self._client = client
+        self._path = path
+        self._filters = tuple(filters)
+        self._orders = tuple(orders)
+        self._projection = projection
+        self._limit = limit
+        self._offset = offset
+        self._start_after = start_after
+
+    def _copy(self, **changes):
+        state = {
+            "filters": self._filters,
+            "orders": self._orders,
+            "projection": self._projection,
+            "limit": self._limit,
+            "offset": self._offset,
+            "start_after": self._start_after,
+            **changes,
+        }
+        return Query(self._client, self._path, **state)
+
+    def where(self, field_path=None, op_string=None, value=None, *, filter=None):
+        if filter is not None:
+            field_path, op_string, value = (
+                filter.field_path,
+                filter.op_string,
+                filter.value,
+            )
+        return self._copy(filters=self._filters + ((field_path, op_string, value),))
+
+    def order_by(self, field_path, direction=ASCENDING):
+        return self._copy(orders=self._orders + ((field_path, direction),))
+
+    def select(self, field_paths):
+        return self._copy(projection=list(field_paths))
+
+    def limit(self, count):
+        return self._copy(limit=count)
+
+    def offset(self, num_to_skip):
+        return self._copy(offset=num_to_skip)
+
+    def start_after(self, document_fields_or_snapshot):
+        return self._copy(start_after=document_fields_or_snapshot)
+
+    def _sort_key(self, doc_id, data):
+        values = []
+        for field_path, _ in self._orders:
+            if field_path == "__name__":
+                values.append(doc_id)
+            else:
+                values.append(_get_path(data, field_path))
+        return values
+
+    def _cursor_key(self):
+        cursor = self._start_after
+        if isinstance(cursor, DocumentSnapshot):
+            return self._sort_key(cursor.id, cursor._data)
+
+        values = []
+        for field_path, _ in self._orders[: len(cursor)]:
+            if field_path == "__name__":
+                value = cursor["__name__"]
+                values.append(
+                    value.id if isinstance(value, DocumentReference) else value
+                )
+            else:
+                values.append(cursor[field_path])
+        return values
+
+    def _compare_keys(self, a, b):
+        for (_, direction), value_a, value_b in zip(self._orders, a, b):
+            result = _compare(value_a, value_b)
+            if result:
+                return result if direction == ASCENDING else -result
+        return 0
+
+    def _matching(self):
+        rows = []
+        for doc_id, (data, create_time, update_time) in self._client._documents(
+            self._path
+        ):
+            try:
+                if not all(
+                    _matches(op, _get_path(data, field_path), value)
+                    for field_path, op, value in self._filters
+                ):
+                    continue
+                key = self._sort_key(doc_id, data)
+            except (KeyError, TypeError):
+                continue
+            rows.append((key, doc_id, data, create_time, update_time))
+
+        if self._orders:
+            compare = functools.cmp_to_key(lambda a, b: self._compare_keys(a[0], b[0]))
+            rows.sort(key=compare)
+
+        if self._start_after is not None:
+            cursor = self._cursor_key()
+            rows = [
+                row
+                for row in rows
+                if self._compare_keys(row[0][: len(cursor)], cursor) > 0
+            ]
+
+        rows = rows[self._offset :]
+        if self._limit is not None:
+            rows = rows[: self._limit]
+        return rows
+
+    def _snapshots(self, rows):
+        collection = CollectionReference(self._client, self._path)
+        for _, doc_id, data, create_time, update_time in rows:
+            if self._projection is not None:
+                data = project(data, self._projection)
+            yield DocumentSnapshot(
+                collection.document(doc_id),
+                copy.deepcopy(data),
+                create_time,
+                update_time,
+            )
+
+    def stream(self):
+        rows = self._matching()
+        # Like Firestore, a query bills at least one read.
+        self._client.reads += len(rows) or 1
+        yield from self._snapshots(rows)
+
+    def on_snapshot(self, callback):
+        return Watch(self, callback)
+
+    def get(self):
+        return list(self.stream())
+
+    def count(self, alias=None):
+        return CountQuery(self, alias or "field_1")
+
+
+class CountQuery:
+    def __init__(self, query, alias):
+        self._query = query
+        self._alias = alias
+
+    def get(self):
+        client = self._query._client
+        total = len(self._query._matching())
+        # Count bills one read per batch of up to 1000 index entries.
+        client.reads += total // 1000 + 1
+        return [[AggregationResult(self._alias, total)]]
+
+
+class Watch:
+    """Listener calling ``callback(docs, changes, read_time)`` after commits.
+
+    Unlike Firestore, callbacks run synchronously in the committing thread.
+    """
+
+    def __init__(self, query, callback):
+        self._query = query
+        self._callback = callback
+        self._versions = {}
+        self._client = query._client
+        self._client._watches.append(self)
+        self._refresh(initial=True)
+
+    def _refresh(self, initial=False):
+        docs = list(self._query._snapshots(self._query._matching()))
+        versions = {doc.id: doc.update_time for doc in docs}
+        changes = []
+
+        for index, doc in enumerate(docs):
+            previous = self._versions.get(doc.id)
+            if previous is None:
+                changes.append(DocumentChange(ChangeType.ADDED, doc, -1, index))
+            elif previous != doc.update_time:
+                changes.append(DocumentChange(ChangeType.MODIFIED, doc, index, index))
+
+        collection = CollectionReference(self._client, self._query._path)
+        for doc_id in self._versions.keys() - versions.keys():
+            doc = DocumentSnapshot(collection.document(doc_id), None)
+            changes.append(DocumentChange(ChangeType.REMOVED, doc, 0, -1))
+
+        self._versions = versions
+        if changes or initial:
+            self._client.reads += len(changes)
+            self._callback(docs, changes, self._client._now())
+
+    def unsubscribe(self):
+        if self in self._client._watches:
+            self._client._watches.remove(self)
+
+
+class CollectionReference(Query):
+    def __init__(self, client, path):
+        super().__init__(client, path.strip("/"))
+
+    @property
+    def id(self):
+        return _split(self._path)[1]
+
+    def document(self, document_id=None):
+        if document_id is None:
+            document_id = uuid.uuid4().hex[:20]
+        return DocumentReference(self._client, f"{self._path}/{document_id}")
+
+    def add(self, document_data, document_id=None):
+        doc_ref = self.document(document_id)
+        doc_ref.create(document_data)
+        return None, doc_ref
+
+
+class WriteBatch:
+    def __init__(self, client):
+        self._client = client
+        self._writes = []
+
+    def __len__(self):
+        return len(self._writes)
+
+    def create(self, reference, document_data):
+        self._writes.append(("create", reference, copy.deepcopy(document_data)))
+
+    def set(self, reference, document_data, merge=False):
+        op = "merge" if merge else "set"
+        self._writes.append((op, reference, copy.deepcopy(document_data)))
+
+    def update(self, reference, field_updates):
+        self._writes.append(("update", reference, copy.deepcopy(field_updates)))
+
+    def delete(self, reference):
+        self._writes.append(("delete", reference, None))
+
+    def commit(self):
+        writes, self._writes = self._writes, []
+        return self._client._commit(writes)
+
+
+class InMemoryFirestore:
+    """Drop-in replacement for a ``firestore.Client`` backed by dicts.
+
+    ``latency`` adds a fixed delay (in seconds) to every read and commit to
+    approximate network round trips.
+    """
+
+    def __init__(self, latency=0):
+        self.latency = latency
+        self._collections = {}
+        self._lock = threading.RLock()
+        self._clock = itertools.count(1)
+        self.reads = 0
+        self.commits = 0
+        self._watches = []
+
+    def _wait(self):
+        if self.latency:
+            threading.Event().wait(self.latency)
+
+    def _now(self):
+        base = datetime.datetime(2020, 1, 1, tzinfo=datetime.timezone.utc)
+        return base + datetime.timedelta(microseconds=next(self._clock))
+
+    def _documents(self, path):
+        self._wait()
+        with self._lock:
+            return list(self._collections.get(path, {}).items())
+
+    def _snapshot(self, reference, field_paths=None, wait=True):
+        if wait:
+            self._wait()
+        self.reads += 1
+        with self._lock:
+            entry = self._collections.get(reference._parent_path, {}).get(reference.id)
+
+        if entry is None:
+            return DocumentSnapshot(reference, None)
+
+        data, create_time, update_time = entry
+        if field_paths is not None:
+            data = project(data, field_paths)
+        return DocumentSnapshot(
+            reference, copy.deepcopy(data), create_time, update_time
+        )
+
+    def _commit(self, writes):
+        self._wait()
+        with self._lock:
+            for op, reference, _ in writes:
+                exists = reference.id in self._collections.get(
+                    reference._parent_path, {}
+                )
+                if op == "create" and exists:
+                    raise AlreadyExists(f"Document already exists: {reference.path}")
+                if op == "update" and not exists:
+                    raise NotFound(f"No document to update: {reference.path}")
+
+            update_time = self._now()
+            for op, reference, data in writes:
+                collection = self._collections.setdefault(reference._parent_path, {})
+                current = collection.get(reference.id)
+                create_time = current[1] if current else update_time
+
+                if op == "delete":
+                    collection.pop(reference.id, None)
+                elif op in ("update", "merge") and current:
+                    merged = copy.deepcopy(current[0])
+                    for field_path, value in data.items():
+                        target = merged
+                        parts = field_path.split(".")
+                        for part in parts[:-1]:
+                            target = target.setdefault(part, {})
+                        target[parts[-1]] = value
+                    collection[reference.id] = (merged, create_time, update_time)
+                else:
+                    collection[reference.id] = (data, create_time, update_time)
+
+            self.commits += 1
+
+        for watch in list(self._watches):
+            watch._refresh()
+        return [update_time for _ in writes]
+
+    def collection(self, collection_path):
+        return CollectionReference(self, collection_path)
+
+    def document(self, document_path):
+        return DocumentReference(self, document_path)
+
+    def batch(self):
+        return WriteBatch(self)
+
+    def get_all(self, references, field_paths=None):
+        self._wait()
+        for reference in references:
+            yield self._snapshot(reference, field_paths, wait=False)
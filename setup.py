@@ -40,5 +40,6 @@ setup(
     packages=['firefalcon'],
     python_requires=">=3.8",
     install_requires=REQUIRES,
+    extras_require={"orjson": ["orjson >= 3.0.0"]},
     include_package_data=True,
 )
\ No newline at end of file
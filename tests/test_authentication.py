@@ -0,0 +1,127 @@
+import falcon
+import falcon.asgi
+import pytest
+from falcon import testing
+from firefalcon.asgi import AsyncAuthentication
+from firefalcon.authentication import Authentication
+
+
+class FakeAuth:
+    class RevokedIdTokenError(Exception):
+        pass
+
+    def __init__(self):
+        self.calls = 0
+        self.revoked = set()
+
+    def verify_id_token(self, id_token, check_revoked=False):
+        self.calls += 1
+        if id_token in self.revoked:
+            raise self.RevokedIdTokenError(id_token)
+        if id_token == "bad":
+            raise ValueError(id_token)
+        return {"uid": id_token, "exp": 2000}
+
+
+class Clock:
+    now = 1000
+
+    def __call__(self):
+        return self.now
+
+
+class Whoami:
+    def on_get(self, req, resp):
+        resp.media = req.context.token
+
+
+@pytest.fixture
+def fake_auth():
+    return FakeAuth()
+
+
+@pytest.fixture
+def clock():
+    return Clock()
+
+
+@pytest.fixture
+def authentication(fake_auth, clock):
+    return Authentication(fake_auth, recheck_interval=60, clock=clock)
+
+
+@pytest.fixture
+def client(authentication):
+    api = falcon.App(middleware=[authentication])
+    api.add_route("/whoami", Whoami())
+    return testing.TestClient(api)
+
+
+def get(client, token):
+    return client.simulate_get("/whoami", headers={"Authorization": f"Bearer {token}"})
+
+
+def test_token_is_verified_once(client, fake_auth, authentication):
+    for _ in range(5):
+        response = get(client, "alice")
+        assert response.status == falcon.HTTP_200
+        assert response.json["uid"] == "alice"
+
+    assert fake_auth.calls == 1
+    assert authentication.cache.hits == 4
+    assert authentication.cache.misses == 1
+
+
+def test_token_is_rechecked_after_interval(client, fake_auth, clock):
+    get(client, "alice")
+    fake_auth.revoked.add("alice")
+
+    clock.now += 30
+    assert get(client, "alice").status == falcon.HTTP_200
+
+    clock.now += 31
+    response = get(client, "alice")
+    assert response.status == falcon.HTTP_401
+    assert "revoked" in response.json["description"]
+
+
+def test_token_expiry_caps_cache_lifetime(fake_auth, clock):
+    authentication = Authentication(fake_auth, recheck_interval=3600, clock=clock)
+    authentication.verify("alice")
+
+    clock.now = 2000
+    authentication.verify("alice")
+    assert fake_auth.calls == 2
+
+
+def test_invalid_and_missing_tokens(client):
+    response = get(client, "bad")
+    assert response.status == falcon.HTTP_401
+    assert "not valid" in response.json["description"]
+
+    response = client.simulate_get("/whoami")
+    assert response.status == falcon.HTTP_401
+    assert response.headers["WWW-Authenticate"] == 'Token type="Bearer"'
+
+
+def test_cache_can_be_disabled(fake_auth):
+    authentication = Authentication(fake_auth, cache_size=0)
+    authentication.verify("alice")
+    authentication.verify("alice")
+    assert fake_auth.calls == 2
+
+
+def test_async_authentication(fake_auth, clock):
+    class AsyncWhoami:
+        async def on_get(self, req, resp):
+            resp.media = req.context.token
+
+    authentication = AsyncAuthentication(fake_auth, clock=clock)
+    api = falcon.asgi.App(middleware=[authentication])
+    api.add_route("/whoami", AsyncWhoami())
+    client = testing.TestClient(api)
+
+    assert get(client, "alice").json["uid"] == "alice"
+    assert get(client, "alice").json["uid"] == "alice"
+    assert get(client, "bad").status == falcon.HTTP_401
+    assert fake_auth.calls == 2
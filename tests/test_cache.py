@@ -0,0 +1,50 @@
+from firefalcon._cache import TTLCache
+
+
+class Clock:
+    now = 0
+
+    def __call__(self):
+        return self.now
+
+
+def test_lru_eviction():
+    cache = TTLCache(maxsize=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+
+    assert "a" in cache and "c" in cache
+    assert "b" not in cache
+    assert cache.stats()["evictions"] == 1
+
+
+def test_entries_expire():
+    clock = Clock()
+    cache = TTLCache(maxsize=10, ttl=5, clock=clock)
+    cache.set("a", 1)
+    cache.set("b", 2, expires_at=2)
+
+    clock.now = 3
+    assert cache.get("a") == 1
+    assert cache.get("b") is None
+
+    clock.now = 6
+    assert cache.get("a") is None
+    assert cache.stats() == {
+        "size": 0,
+        "maxsize": 10,
+        "hits": 1,
+        "misses": 2,
+        "hit_ratio": 1 / 3,
+        "evictions": 0,
+        "expirations": 2,
+    }
+
+
+def test_zero_size_disables_cache():
+    cache = TTLCache(maxsize=0)
+    cache.set("a", 1)
+    assert cache.get("a") is None
+    assert len(cache) == 0
@@ -0,0 +1,66 @@
+import datetime
+
+import pytest
+from pydantic import ValidationError
+from firefalcon._filters import Filter, parse_where, required_index
+from firefalcon._schemas import BaseQuerySchema
+
+
+def test_parse_typed_values():
+    filters = parse_where(
+        "status == 'active' AND age >= 21 AND score < -1.5 AND deleted = null"
+        ' AND created > 2021-01-02T00:00:00Z AND tags array-contains-any [a, "b c"]'
+    )
+    assert filters == (
+        Filter("status", "==", "active"),
+        Filter("age", ">=", 21),
+        Filter("score", "<", -1.5),
+        Filter("deleted", "==", None),
+        Filter(
+            "created",
+            ">",
+            datetime.datetime(2021, 1, 2, tzinfo=datetime.timezone.utc),
+        ),
+        Filter("tags", "array_contains_any", ("a", "b c")),
+    )
+
+
+def test_parsed_plans_are_cached():
+    assert parse_where("a in [1, 2] and b != true") is parse_where(
+        "a in [1, 2] and b != true"
+    )
+
+
+@pytest.mark.parametrize(
+    "where",
+    [
+        "age",
+        "age >=",
+        "age ~ 1",
+        "age in 1",
+        "age == [1]",
+        "a == 1 OR b == 2",
+        "1a == 2",
+    ],
+)
+def test_invalid_where(where):
+    with pytest.raises(ValueError):
+        parse_where(where)
+
+
+def test_schema_orders_by_range_field():
+    params = BaseQuerySchema(where="age > 20 AND name == x")
+    assert params.where[0] == Filter("age", ">", 20)
+    assert params.order_by == "age"
+
+    with pytest.raises(ValidationError):
+        BaseQuerySchema(where="age >")
+
+
+def test_required_index():
+    assert required_index(parse_where("a == 1 AND b == 2")) is None
+    assert required_index(parse_where("a > 1 AND a < 5"), "a") is None
+    assert required_index(parse_where("a == 1"), "a") is None
+    assert required_index(parse_where("a == 1"), "b") == {"a", "b"}
+    assert required_index(parse_where("a == 1 AND b > 2"), "b") == {"a", "b"}
+    assert required_index(parse_where("a > 1 AND b > 2")) == {"a", "b"}
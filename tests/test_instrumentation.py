@@ -0,0 +1,62 @@
+import falcon
+import pytest
+from falcon import testing
+from firefalcon.authentication import Authentication
+from firefalcon.firestore import FirstoreBaseResource
+from firefalcon.instrumentation import Histogram, InMemorySink, Instrumentation
+from firefalcon.testing import InMemoryFirestore
+
+
+class FakeAuth:
+    def verify_id_token(self, id_token, check_revoked=False):
+        return {"uid": id_token}
+
+
+@pytest.fixture
+def sink():
+    return InMemorySink()
+
+
+def make_client(middleware):
+    db = InMemoryFirestore()
+    db.document("users/ann").set({"name": "Ann"})
+
+    user = FirstoreBaseResource(db=db, resource_type="user")
+    api = falcon.App(middleware=middleware)
+    api.add_route("/users", user)
+    api.add_route("/users/{user_id}", user, suffix="doc")
+    return testing.TestClient(api)
+
+
+def test_server_timing_and_sink(sink):
+    client = make_client([Instrumentation(sink), Authentication(FakeAuth())])
+    headers = {"Authorization": "Bearer ann"}
+
+    response = client.simulate_get("/users", headers=headers)
+    assert response.status == falcon.HTTP_200
+
+    phases = [
+        item.split(";")[0] for item in response.headers["server-timing"].split(", ")
+    ]
+    assert phases == ["auth", "authz", "validate", "firestore", "serialize", "total"]
+
+    client.simulate_get("/users/ann", headers=headers)
+    snapshot = sink.snapshot()
+    assert snapshot[("/users", "firestore")]["count"] == 1
+    assert snapshot[("/users/{user_id}", "total")]["count"] == 1
+
+
+def test_disabled_instrumentation_adds_nothing():
+    response = make_client([]).simulate_get("/users")
+    assert response.status == falcon.HTTP_200
+    assert "server-timing" not in response.headers
+
+
+def test_histogram_quantiles():
+    histogram = Histogram(buckets=(1, 10, 100))
+    for value in (0.5, 5, 5, 50):
+        histogram.observe(value)
+
+    assert histogram.quantile(0.5) == 10
+    assert histogram.quantile(0.99) == 100
+    assert Histogram().quantile(0.5) is None
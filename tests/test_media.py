@@ -0,0 +1,56 @@
+import datetime
+
+import falcon
+from falcon import testing
+from google.api_core.datetime_helpers import DatetimeWithNanoseconds
+from google.cloud.firestore_v1 import GeoPoint
+from pydantic import BaseModel
+from firefalcon.firestore import FirstoreBaseResource
+from firefalcon.media import dumps, install_media_handlers, loads
+from firefalcon.testing import InMemoryFirestore
+
+
+class User(BaseModel):
+    name: str
+    age: int
+
+
+def test_dumps_firestore_values():
+    db = InMemoryFirestore()
+    value = {
+        "when": DatetimeWithNanoseconds(
+            2021, 1, 2, 3, 4, 5, nanosecond=123456789, tzinfo=datetime.timezone.utc
+        ),
+        "where": GeoPoint(51.5, -0.1),
+        "ref": db.document("users/u1"),
+        "blob": b"\x00\x01",
+        "user": User(name="A", age=1),
+    }
+    assert loads(dumps(value)) == {
+        "when": "2021-01-02T03:04:05.123456789Z",
+        "where": {"latitude": 51.5, "longitude": -0.1},
+        "ref": "users/u1",
+        "blob": "AAE=",
+        "user": {"name": "A", "age": 1},
+    }
+
+
+def test_installed_handler_serves_resources():
+    db = InMemoryFirestore()
+    db.document("users/u1").set({"name": "A", "age": 1})
+
+    api = falcon.App()
+    install_media_handlers(api)
+    user = FirstoreBaseResource(db=db, resource_type="user", schema_get=User)
+    api.add_route("/users", user)
+    api.add_route("/users/{user_id}", user, suffix="doc")
+    client = testing.TestClient(api)
+
+    response = client.simulate_get("/users")
+    assert response.json["data"][0]["attributes"] == {"name": "A", "age": 1}
+
+    response = client.simulate_post("/users", json={"name": "B", "age": 2})
+    assert response.status == falcon.HTTP_201
+
+    response = client.simulate_get("/users/u1")
+    assert response.json["links"]["data"]["attributes"] == {"name": "A", "age": 1}
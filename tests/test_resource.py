@@ -0,0 +1,216 @@
+import falcon
+import pytest
+from falcon import testing
+from pydantic import BaseModel
+from firefalcon.firestore import FirstoreBaseResource
+from firefalcon.media import install_media_handlers
+from firefalcon.testing import InMemoryFirestore
+
+
+class User(BaseModel):
+    name: str
+    age: int
+
+
+def make_client(db, **options):
+    user = FirstoreBaseResource(db=db, resource_type="user", **options)
+    api = falcon.App()
+
+    api.add_route("/users", user)
+    api.add_route("/users/{user_id}", user, suffix="doc")
+
+    client = testing.TestClient(api)
+    client.resource = user
+    return client
+
+
+@pytest.fixture
+def db():
+    db = InMemoryFirestore()
+    for i in range(25):
+        db.document(f"users/u{i:02}").set({"name": f"User {i}", "age": 20 + i % 7})
+    return db
+
+
+@pytest.fixture
+def client(db):
+    return make_client(db)
+
+
+def collect_pages(client, params):
+    ids = []
+    response = client.simulate_get("/users", params=params)
+    while True:
+        assert response.status == falcon.HTTP_200
+        ids.extend(item["id"] for item in response.json["data"])
+        next_link = response.json["links"].get("next")
+        if next_link is None:
+            return ids
+        response = client.simulate_get("/users", query_string=next_link.split("?")[1])
+
+
+def test_cursor_pagination_visits_every_document(client):
+    ids = collect_pages(client, {"limit": 10})
+    assert ids == [f"u{i:02}" for i in range(25)]
+
+
+def test_cursor_pagination_with_order_by(client, db):
+    ids = collect_pages(
+        client, {"limit": 4, "order_by": "age", "order_dir": "DESCENDING"}
+    )
+    docs = db.collection("users").order_by("age", "DESCENDING").get()
+    assert sorted(ids) == sorted(doc.id for doc in docs)
+    ages = [db.document(f"users/{i}").get().get("age") for i in ids]
+    assert ages == sorted(ages, reverse=True)
+
+
+def test_streamed_collection_matches_buffered(db):
+    buffered = make_client(db).simulate_get("/users", params={"limit": 7})
+    streamed = make_client(db, stream=True, stream_chunk_size=64).simulate_get(
+        "/users", params={"limit": 7}
+    )
+    assert streamed.status == falcon.HTTP_200
+    assert streamed.json == buffered.json
+
+
+def test_get_doc_etag_and_cache(db):
+    client = make_client(db, doc_cache_size=10)
+
+    response = client.simulate_get("/users/u01")
+    assert response.json["links"]["data"]["attributes"]["name"] == "User 1"
+    etag = response.headers["etag"]
+
+    response = client.simulate_get("/users/u01", headers={"If-None-Match": etag})
+    assert response.status == falcon.HTTP_304
+    assert client.resource.doc_cache.hits == 1
+
+    client.simulate_patch("/users/u01", json={"name": "Renamed"})
+    response = client.simulate_get("/users/u01", headers={"If-None-Match": etag})
+    assert response.status == falcon.HTTP_200
+    assert response.headers["etag"] != etag
+    assert response.json["links"]["data"]["attributes"]["name"] == "Renamed"
+
+    assert client.simulate_get("/users/nobody").status == falcon.HTTP_404
+
+
+def test_bulk_create(db):
+    client = make_client(db, schema_post=User, bulk_batch_size=2)
+    items = [{"name": "A", "age": 1}, {"name": "B"}, {"name": "C", "age": 3}]
+
+    response = client.simulate_post("/users", json=items)
+    assert response.status == falcon.HTTP_207
+    assert [item["meta"]["index"] for item in response.json["data"]] == [0, 2]
+    assert [error["source"]["pointer"] for error in response.json["errors"]] == ["/1"]
+    assert db.commits == 25 + 1
+
+    for item in response.json["data"]:
+        assert db.document(f"users/{item['id']}").get().exists
+
+
+@pytest.mark.parametrize("mode", ["full", "sampled", "trusted"])
+def test_read_validation_modes(db, mode):
+    db.document("users/bad").set({"name": "Bad", "age": "unknown"})
+    client = make_client(db, schema_get=User, read_validation=mode, read_sample_rate=2)
+
+    response = client.simulate_get("/users", params={"limit": 1000})
+    if mode == "trusted":
+        assert response.status == falcon.HTTP_200
+    else:
+        assert response.status == falcon.HTTP_400
+
+
+def test_sparse_fieldsets(db):
+    client = make_client(db, schema_get=User)
+
+    response = client.simulate_get("/users", params={"fields": "name", "limit": 2})
+    assert response.status == falcon.HTTP_200
+    assert [item["attributes"] for item in response.json["data"]] == [
+        {"name": "User 0"},
+        {"name": "User 1"},
+    ]
+
+    response = client.simulate_get("/users/u03", params={"fields[user]": "age"})
+    assert response.json["links"]["data"]["attributes"] == {"age": 23}
+
+
+def test_where_filters_are_pushed_down(db):
+    client = make_client(db, indexes=[("age", "name")])
+
+    response = client.simulate_get("/users", params={"where": "age >= 25"})
+    assert response.status == falcon.HTTP_200
+    assert {item["attributes"]["age"] for item in response.json["data"]} == {25, 26}
+    assert db.reads == len(response.json["data"])
+
+    ids = collect_pages(client, {"where": "age in [20, 21]", "limit": 3})
+    assert ids == ["u00", "u01", "u07", "u08", "u14", "u15", "u21", "u22"]
+
+    response = client.simulate_get(
+        "/users", params={"where": "age > 21 AND name == 'User 3'"}
+    )
+    assert [item["id"] for item in response.json["data"]] == ["u03"]
+
+    response = client.simulate_get(
+        "/users", params={"where": "age == 20", "order_by": "created"}
+    )
+    assert response.status == falcon.HTTP_400
+    assert "(age, created)" in response.json["description"]
+
+
+def test_count_totals(db):
+    client = make_client(db, count_cache_size=10)
+
+    response = client.simulate_get("/users", params={"count": "only"})
+    assert response.json["meta"] == {"total": 25}
+    assert "data" not in response.json
+    assert db.reads == 1
+
+    response = client.simulate_get(
+        "/users", params={"count": "true", "where": "age == 20", "limit": 2}
+    )
+    assert response.json["meta"] == {"total": 4}
+    assert len(response.json["data"]) == 2
+
+    client.simulate_get("/users", params={"count": "only"})
+    assert client.resource.count_cache.hits == 1
+
+    streamed = make_client(db, stream=True).simulate_get(
+        "/users", params={"count": "true", "where": "age == 20"}
+    )
+    assert streamed.json["meta"] == {"total": 4}
+
+    response = client.simulate_get("/users", params={"count": "maybe"})
+    assert response.status == falcon.HTTP_400
+
+
+def test_multi_get_and_include(db):
+    db.document("teams/t1").set({"name": "Red"})
+    db.document("teams/t2").set({"name": "Blue"})
+    db.document("users/u01").update({"team": "t1"})
+    db.document("users/u02").update({"team": "t2"})
+    db.document("users/u03").update({"team": db.document("teams/t1")})
+    client = make_client(db, doc_cache_size=10, relationships={"team": "teams"})
+    # References in attributes need the Firestore-aware JSON handler.
+    install_media_handlers(client.app)
+    client.simulate_get("/users/u02")
+    reads = db.reads
+
+    response = client.simulate_get(
+        "/users", params={"ids": "u03,u01,nobody,u02,u01", "include": "team"}
+    )
+    assert response.status == falcon.HTTP_200
+    assert [item["id"] for item in response.json["data"]] == ["u03", "u01", "u02"]
+    assert response.json["meta"] == {"missing": ["nobody"]}
+    assert sorted(item["id"] for item in response.json["included"]) == ["t1", "t2"]
+    assert response.json["included"][0]["type"] == "teams"
+    # u02 came from the document cache; the rest took one get_all each.
+    assert db.reads - reads == 3 + 2
+
+    response = client.simulate_get("/users", params={"limit": 2, "include": "team"})
+    assert [item["id"] for item in response.json["included"]] == ["t1"]
+
+    assert client.simulate_get("/users", params={"include": "boss"}).status == (
+        falcon.HTTP_400
+    )
+    assert client.simulate_get("/users", params={"ids": "a/b"}).status == (
+        falcon.HTTP_400
+    )
@@ -0,0 +1,62 @@
+from typing import List
+
+import pytest
+from pydantic import BaseModel, Field, ValidationError, validator
+from firefalcon._schemas import BaseQuerySchema, validate_fields
+from firefalcon._utils import project
+
+
+class Address(BaseModel):
+    city: str
+    zip: str
+
+
+class User(BaseModel):
+    name: str
+    age: int
+    email: str = Field(alias="emailAddress")
+    addresses: List[Address]
+
+    @validator("name")
+    def title_name(cls, v):
+        return v.title()
+
+
+def test_fields_param_is_split():
+    assert BaseQuerySchema(fields="name, age").fields == ["name", "age"]
+    assert BaseQuerySchema(fields=["name", "age,email"]).fields == [
+        "name",
+        "age",
+        "email",
+    ]
+    assert BaseQuerySchema.parse_obj({"fields[user]": "name"}).fields == ["name"]
+    assert BaseQuerySchema().fields is None
+
+
+def test_validate_fields_only_checks_projection():
+    data = {"name": "ann smith", "age": "42"}
+    assert validate_fields(User, data, ["name", "age"]) == {
+        "name": "Ann Smith",
+        "age": 42,
+    }
+
+
+def test_validate_fields_nested_and_aliases():
+    data = {
+        "emailAddress": "ann@example.com",
+        "addresses": [{"city": "Oslo", "zip": "0150"}],
+    }
+    assert validate_fields(User, data, ["emailAddress", "addresses"]) == {
+        "email": "ann@example.com",
+        "addresses": [{"city": "Oslo", "zip": "0150"}],
+    }
+
+
+def test_validate_fields_reports_errors():
+    with pytest.raises(ValidationError):
+        validate_fields(User, {"age": "old"}, ["age"])
+
+
+def test_project_dotted_paths():
+    data = {"name": "Ann", "address": {"city": "Oslo", "zip": "0150"}}
+    assert project(data, ["address.city", "missing"]) == {"address": {"city": "Oslo"}}
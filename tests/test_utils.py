@@ -0,0 +1,90 @@
+import datetime
+
+import pytest
+from pydantic import ValidationError
+from firefalcon._schemas import BaseQuerySchema
+from firefalcon._utils import (
+    create_collection_query,
+    create_cursor,
+    create_etag,
+    decode_cursor,
+    encode_cursor,
+    etag_matches,
+)
+
+
+class RecordingQuery:
+    def __init__(self, calls=()):
+        self.calls = list(calls)
+
+    def __getattr__(self, name):
+        def record(*args, **kwargs):
+            return RecordingQuery(self.calls + [(name, args, kwargs)])
+
+        return record
+
+
+class Snapshot:
+    def __init__(self, id, data):
+        self.id = id
+        self._data = data
+
+    def get(self, field_path):
+        return self._data[field_path]
+
+
+def test_cursor_round_trip():
+    values = {
+        "__name__": "abc",
+        "created": datetime.datetime(2020, 1, 2, 3, 4, 5),
+    }
+    cursor = encode_cursor(values)
+    assert "=" not in cursor
+    assert decode_cursor(cursor) == values
+
+
+def test_invalid_cursor():
+    with pytest.raises(ValueError):
+        decode_cursor("not a cursor")
+
+    with pytest.raises(ValidationError):
+        BaseQuerySchema(cursor=encode_cursor({"__name__": "a"}), order_by="name")
+
+
+def test_query_applies_order_and_limit():
+    params = BaseQuerySchema(limit=10, order_by="name", order_dir="descending")
+    query = create_collection_query(RecordingQuery(), params)
+
+    assert query.calls == [
+        ("order_by", ("name",), {"direction": "DESCENDING"}),
+        ("order_by", ("__name__",), {"direction": "DESCENDING"}),
+        ("limit", (10,), {}),
+    ]
+
+
+def test_query_starts_after_cursor():
+    cursor = create_cursor(
+        Snapshot("abc", {"name": "Ann"}), BaseQuerySchema(order_by="name")
+    )
+    params = BaseQuerySchema(order_by="name", cursor=cursor, offset=20)
+    query = create_collection_query(RecordingQuery(), params)
+
+    assert ("start_after", ({"__name__": "abc", "name": "Ann"},), {}) in query.calls
+    assert not any(name == "offset" for name, _, _ in query.calls)
+
+
+def test_limit_is_bounded():
+    with pytest.raises(ValidationError):
+        BaseQuerySchema(limit=100000)
+
+
+def test_etag_matching():
+    etag = create_etag(datetime.datetime(2020, 1, 2, 3, 4, 5))
+    other = create_etag(datetime.datetime(2020, 1, 2, 3, 4, 6))
+
+    assert etag.startswith('"') and etag != other
+    assert etag_matches(etag, etag)
+    assert etag_matches(f"{other}, W/{etag}", etag)
+    assert etag_matches("*", etag)
+    assert not etag_matches(other, etag)
+    assert not etag_matches(None, etag)